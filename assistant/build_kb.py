@@ -1,7 +1,7 @@
 import os
 import json
 from datetime import datetime
-from data_loader import get_arxiv_papers, extract_text_from_pdf
+from data_loader import get_arxiv_papers, extract_text_from_pdfs
 from vector_db import create_vector_store
 
 def build_knowledge_base():
@@ -19,12 +19,15 @@ def build_knowledge_base():
 
     print(f"Retrieved {len(papers)} papers from ArXiv")
     
+    # Download and extract all PDFs concurrently
+    print(f"Extracting text from {len(papers)} PDFs...")
+    texts = extract_text_from_pdfs([paper['pdf_url'] for paper in papers])
+    
     # Process documents
     documents = []
-    for i, paper in enumerate(papers):
+    for i, (paper, text) in enumerate(zip(papers, texts)):
         try:
             print(f"Processing [{i+1}/{len(papers)}]: {paper['title']}")
-            text = extract_text_from_pdf(paper['pdf_url'])
             if not text or len(text.strip()) == 0:
                 print(f"Warning: No text extracted from {paper['title']}")
                 continue
@@ -14,52 +14,530 @@ A sophisticated AI agent with human-like conversational abilities:
 - Multilingual conversational support
 """
 
+import importlib.util
 import os
 import re
 import json
 import logging
+import math
+import threading
 import time
 import uuid
+from collections import Counter, OrderedDict, defaultdict, deque
+from functools import cached_property, lru_cache
+from itertools import islice
 from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime, timedelta
 from pathlib import Path
-import pickle
-import hashlib
 
-# Language detection
+# Language detection and advanced NLP capabilities; both are imported on first use
+LANGDETECT_AVAILABLE = importlib.util.find_spec('langdetect') is not None
+NLTK_AVAILABLE = importlib.util.find_spec('nltk') is not None
+
+# Fast JSON parsing for paper dumps
 try:
-    from langdetect import detect, DetectorFactory
-    from langdetect.lang_detect_exception import LangDetectException
-    DetectorFactory.seed = 0
-    LANGDETECT_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Vectorized similarity for the semantic search cache
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
 except ImportError:
-    LANGDETECT_AVAILABLE = False
+    NUMPY_AVAILABLE = False
 
-# Advanced NLP capabilities
+# JIT compilation for numerical helpers
 try:
-    import nltk
-    from nltk.sentiment import SentimentIntensityAnalyzer
-    from nltk.tokenize import sent_tokenize, word_tokenize
-    from nltk.corpus import stopwords
-    NLTK_AVAILABLE = True
+    from numba import njit
+    NUMBA_AVAILABLE = True
 except ImportError:
-    NLTK_AVAILABLE = False
+    NUMBA_AVAILABLE = False
+
+# Multi-pattern topic scanning
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Static topic bodies, built once at import instead of on every response
+_TOPIC_RESPONSES = {
+    'black_scholes': {
+        'es': """
+## 📈 El Modelo Black-Scholes
+
+El modelo Black-Scholes es fundamental en finanzas cuantitativas para valorar opciones europeas.
+
+### 🎯 Fórmula Principal:
+**C = S₀ × N(d₁) - K × e^(-rT) × N(d₂)**
+
+### 🔑 Variables Clave:
+- **S₀**: Precio actual del activo
+- **K**: Precio de ejercicio  
+- **r**: Tasa libre de riesgo
+- **T**: Tiempo hasta vencimiento
+- **σ**: Volatilidad del activo
+
+### 💡 Intuición:
+El modelo calcula el valor presente esperado del payoff de la opción bajo medida neutral al riesgo.
+
+### ⚙️ Supuestos Importantes:
+1. Volatilidad constante
+2. Tasa de interés constante
+3. No hay dividendos
+4. Mercados eficientes
+
+### 🎪 Las "Griegas":
+- **Delta (Δ)**: Sensibilidad al precio del subyacente
+- **Gamma (Γ)**: Convexidad del delta
+- **Theta (Θ)**: Decaimiento temporal
+- **Vega (ν)**: Sensibilidad a la volatilidad
+""",
+        'en': """
+## 📈 The Black-Scholes Model
+
+The Black-Scholes model is fundamental in quantitative finance for valuing European options.
+
+### 🎯 Core Formula:
+**C = S₀ × N(d₁) - K × e^(-rT) × N(d₂)**
+
+### 🔑 Key Variables:
+- **S₀**: Current asset price
+- **K**: Strike price
+- **r**: Risk-free rate
+- **T**: Time to expiration
+- **σ**: Asset volatility
+
+### 💡 Intuition:
+The model calculates the expected present value of the option's payoff under risk-neutral measure.
+
+### ⚙️ Key Assumptions:
+1. Constant volatility
+2. Constant interest rate
+3. No dividends
+4. Efficient markets
+
+### 🎪 The "Greeks":
+- **Delta (Δ)**: Sensitivity to underlying price
+- **Gamma (Γ)**: Delta convexity
+- **Theta (Θ)**: Time decay
+- **Vega (ν)**: Volatility sensitivity
+""",
+    },
+    'var': {
+        'es': """
+## ⚠️ Value at Risk (VaR)
+
+El VaR es una medida estadística que cuantifica el riesgo financiero potencial.
+
+### 🎯 Definición:
+**"Hay una probabilidad X% de que las pérdidas no excedan $Y en Z días"**
+
+### 📊 Métodos de Cálculo:
+
+#### 1. **Método Paramétrico**
+- Asume normalidad de retornos
+- VaR = μ - Z_α × σ × √t
+- Rápido pero limitado
+
+#### 2. **Simulación Histórica**
+- Usa datos reales del pasado
+- No asume distribución específica
+- Captura mejor las colas pesadas
+
+#### 3. **Monte Carlo**
+- Simula miles de escenarios
+- Muy flexible y preciso
+- Computacionalmente intensivo
+
+### 💼 Aplicaciones Prácticas:
+- Límites de riesgo
+- Requerimientos de capital
+- Informes regulatorios
+- Gestión de portafolios
+""",
+        'en': """
+## ⚠️ Value at Risk (VaR)
+
+VaR is a statistical measure that quantifies potential financial risk.
+
+### 🎯 Definition:
+**"There is an X% probability that losses will not exceed $Y over Z days"**
+
+### 📊 Calculation Methods:
+
+#### 1. **Parametric Method**
+- Assumes return normality
+- VaR = μ - Z_α × σ × √t
+- Fast but limited
+
+#### 2. **Historical Simulation**
+- Uses actual past data
+- No specific distribution assumption
+- Better captures fat tails
+
+#### 3. **Monte Carlo**
+- Simulates thousands of scenarios
+- Very flexible and accurate
+- Computationally intensive
+
+### 💼 Practical Applications:
+- Risk limits
+- Capital requirements
+- Regulatory reporting
+- Portfolio management
+""",
+    },
+    'portfolio': {
+        'es': """
+## 📊 Optimización de Portafolios (Markowitz)
+
+La teoría moderna de portafolios busca maximizar retorno por unidad de riesgo.
+
+### 🎯 Objetivo:
+Encontrar la combinación óptima de activos que maximice la utilidad del inversor.
+
+### 🔢 Formulación Matemática:
+- **Retorno**: E(Rp) = Σ wi × E(Ri)
+- **Riesgo**: σp² = Σ Σ wi × wj × σij
+
+### 📈 Frontera Eficiente:
+Conjunto de portafolios que ofrecen:
+- Máximo retorno para un nivel de riesgo dado
+- Mínimo riesgo para un nivel de retorno dado
+
+### ⚙️ Proceso de Optimización:
+1. Estimar retornos esperados
+2. Calcular matriz de covarianzas
+3. Resolver problema de optimización
+4. Construir frontera eficiente
+
+### 🎪 Ratio de Sharpe:
+**S = (E(Rp) - Rf) / σp**
+
+Mide el retorno excesivo por unidad de riesgo.
+""",
+        'en': """
+## 📊 Portfolio Optimization (Markowitz)
+
+Modern portfolio theory seeks to maximize return per unit of risk.
+
+### 🎯 Objective:
+Find the optimal combination of assets that maximizes investor utility.
+
+### 🔢 Mathematical Formulation:
+- **Return**: E(Rp) = Σ wi × E(Ri)
+- **Risk**: σp² = Σ Σ wi × wj × σij
+
+### 📈 Efficient Frontier:
+Set of portfolios offering:
+- Maximum return for given risk level
+- Minimum risk for given return level
+
+### ⚙️ Optimization Process:
+1. Estimate expected returns
+2. Calculate covariance matrix
+3. Solve optimization problem
+4. Construct efficient frontier
+
+### 🎪 Sharpe Ratio:
+**S = (E(Rp) - Rf) / σp**
+
+Measures excess return per unit of risk.
+""",
+    },
+}
+
+
+def _bs_call_greeks(S: float, K: float, T: float, r: float, sigma: float):
+    """Closed-form Black-Scholes call price and Greeks (theta per year, vega/rho per unit)."""
+    sqrt_T = math.sqrt(T)
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrt_T)
+    d2 = d1 - sigma * sqrt_T
+    n_d1 = 0.5 * (1.0 + math.erf(d1 / math.sqrt(2.0)))
+    n_d2 = 0.5 * (1.0 + math.erf(d2 / math.sqrt(2.0)))
+    pdf_d1 = math.exp(-0.5 * d1 * d1) / math.sqrt(2.0 * math.pi)
+    discount = math.exp(-r * T)
+    
+    price = S * n_d1 - K * discount * n_d2
+    delta = n_d1
+    gamma = pdf_d1 / (S * sigma * sqrt_T)
+    vega = S * pdf_d1 * sqrt_T
+    theta = -S * pdf_d1 * sigma / (2.0 * sqrt_T) - r * K * discount * n_d2
+    rho = K * T * discount * n_d2
+    return price, delta, gamma, vega, theta, rho
+
+
+if NUMBA_AVAILABLE:
+    _bs_call_greeks = njit(cache=True)(_bs_call_greeks)
+
+
+@lru_cache(maxsize=1024)
+def _cached_call_greeks(S: float, K: float, T: float, r: float, sigma: float) -> Tuple[float, ...]:
+    return tuple(_bs_call_greeks(S, K, T, r, sigma))
+
+
+def black_scholes_greeks(S: float, K: float, T: float, r: float, sigma: float) -> Dict[str, float]:
+    """Price a European call and its Greeks; repeated parameter sets are served from cache."""
+    price, delta, gamma, vega, theta, rho = _cached_call_greeks(float(S), float(K), float(T), float(r), float(sigma))
+    return {'price': price, 'delta': delta, 'gamma': gamma, 'vega': vega, 'theta': theta, 'rho': rho}
+
+
+@lru_cache(maxsize=2)
+def _black_scholes_example(language: str) -> str:
+    """Worked at-the-money example appended to the Black-Scholes explanation."""
+    g = black_scholes_greeks(100.0, 100.0, 1.0, 0.05, 0.20)
+    if language == 'es':
+        header = "### 🧮 Ejemplo Numérico (S₀=100, K=100, T=1 año, r=5%, σ=20%):"
+        theta_label = "por año"
+    else:
+        header = "### 🧮 Worked Example (S₀=100, K=100, T=1 year, r=5%, σ=20%):"
+        theta_label = "per year"
+    return (
+        f"{header}\n"
+        f"- **Call**: {g['price']:.2f}\n"
+        f"- **Delta (Δ)**: {g['delta']:.4f}\n"
+        f"- **Gamma (Γ)**: {g['gamma']:.4f}\n"
+        f"- **Vega (ν)**: {g['vega']:.2f}\n"
+        f"- **Theta (Θ)**: {g['theta']:.2f} {theta_label}\n"
+        f"- **Rho (ρ)**: {g['rho']:.2f}\n"
+    )
+
+
+# General-answer templates; only the question snippet varies per call
+_GENERAL_TEMPLATES = {
+    ('es', 'beginner'): """
+## 💼 Análisis de Finanzas Cuantitativas
+
+Basándome en tu pregunta sobre "{snippet}...", aquí tienes una explicación accesible:
+
+### 🔍 Contexto:
+Las finanzas cuantitativas utilizan matemáticas y estadística para entender los mercados financieros.
+
+### 📊 Conceptos Clave:
+• **Riesgo**: La incertidumbre en los retornos de inversión
+• **Retorno**: Las ganancias o pérdidas de una inversión
+• **Diversificación**: Reducir riesgo invirtiendo en múltiples activos
+• **Valoración**: Determinar el precio justo de un activo
+
+### 🚀 Aplicaciones Prácticas:
+1. Valoración de inversiones
+2. Gestión de riesgos
+3. Optimización de portafolios
+4. Trading algorítmico
+
+### 💡 Consejo:
+Comienza con los conceptos básicos antes de avanzar a modelos más complejos.
+""",
+    ('es', 'advanced'): """
+## 💼 Análisis Avanzado de Finanzas Cuantitativas
+
+Examinando tu consulta sobre "{snippet}...", proporciono un análisis detallado:
+
+### 🔬 Marco Teórico:
+Las finanzas cuantitativas integran:
+- Procesos estocásticos
+- Teoría de probabilidades
+- Optimización matemática
+- Análisis estadístico
+
+### 📈 Metodologías Aplicables:
+• **Modelos de Valoración**: Black-Scholes, Binomial, Monte Carlo
+• **Gestión de Riesgos**: VaR, Expected Shortfall, Stress Testing
+• **Optimización**: Markowitz, Black-Litterman, Risk Parity
+• **Econometría**: GARCH, VAR, Cointegración
+
+### 🎯 Consideraciones Implementación:
+1. Calidad y disponibilidad de datos
+2. Supuestos del modelo y limitaciones
+3. Validación y backtesting
+4. Aspectos computacionales
+
+### 🔄 Desarrollos Recientes:
+Machine learning, factor investing, ESG integration, crypto assets.
+""",
+    ('en', 'beginner'): """
+## 💼 Quantitative Finance Analysis
+
+Based on your question about "{snippet}...", here's an accessible explanation:
+
+### 🔍 Context:
+Quantitative finance uses mathematics and statistics to understand financial markets.
+
+### 📊 Key Concepts:
+• **Risk**: Uncertainty in investment returns
+• **Return**: Gains or losses from an investment
+• **Diversification**: Reducing risk by investing in multiple assets
+• **Valuation**: Determining the fair price of an asset
+
+### 🚀 Practical Applications:
+1. Investment valuation
+2. Risk management
+3. Portfolio optimization
+4. Algorithmic trading
+
+### 💡 Tip:
+Start with basic concepts before advancing to more complex models.
+""",
+    ('en', 'advanced'): """
+## 💼 Advanced Quantitative Finance Analysis
+
+Examining your query about "{snippet}...", I provide a detailed analysis:
+
+### 🔬 Theoretical Framework:
+Quantitative finance integrates:
+- Stochastic processes
+- Probability theory
+- Mathematical optimization
+- Statistical analysis
+
+### 📈 Applicable Methodologies:
+• **Valuation Models**: Black-Scholes, Binomial, Monte Carlo
+• **Risk Management**: VaR, Expected Shortfall, Stress Testing
+• **Optimization**: Markowitz, Black-Litterman, Risk Parity
+• **Econometrics**: GARCH, VAR, Cointegration
+
+### 🎯 Implementation Considerations:
+1. Data quality and availability
+2. Model assumptions and limitations
+3. Validation and backtesting
+4. Computational aspects
+
+### 🔄 Recent Developments:
+Machine learning, factor investing, ESG integration, crypto assets.
+""",
+}
+
+# Financial topic patterns, compiled once at import
+_TOPIC_PATTERN_SOURCES = {
+    'black_scholes': [
+        r'black.scholes', r'option.pricing', r'european.option',
+        r'bs.model', r'greeks', r'delta.hedging'
+    ],
+    'var': [
+        r'value.at.risk', r'var\b', r'risk.measure', r'quantile',
+        r'expected.shortfall', r'conditional.var', r'riesgo'
+    ],
+    'portfolio': [
+        r'portfolio', r'markowitz', r'efficient.frontier',
+        r'asset.allocation', r'diversification', r'portafolio'
+    ],
+    'derivatives': [
+        r'derivative', r'option', r'future', r'forward', r'swap',
+        r'exotic', r'american.option', r'derivado'
+    ],
+    'monte_carlo': [
+        r'monte.carlo', r'simulation', r'random.sampling',
+        r'path.dependent', r'numerical.method', r'simulación'
+    ],
+    'trading': [
+        r'algorithmic.trading', r'high.frequency', r'market.making',
+        r'execution', r'trading.strategy', r'arbitrage'
+    ],
+    'risk_management': [
+        r'risk.management', r'stress.test', r'scenario.analysis',
+        r'credit.risk', r'market.risk', r'gestión.riesgo'
+    ]
+}
+_TOPIC_PATTERNS = {
+    topic: [re.compile(pattern) for pattern in patterns]
+    for topic, patterns in _TOPIC_PATTERN_SOURCES.items()
+}
+
+# Flattened (topic, pattern) list; the index doubles as the hyperscan pattern id
+_TOPIC_PATTERN_IDS = [
+    (topic, pattern)
+    for topic, patterns in _TOPIC_PATTERN_SOURCES.items()
+    for pattern in patterns
+]
+
+
+def _compile_topic_database():
+    """Compile all topic patterns into one hyperscan database, if available."""
+    if not HYPERSCAN_AVAILABLE:
+        return None
+    
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.encode('utf-8') for _, pattern in _TOPIC_PATTERN_IDS],
+            ids=list(range(len(_TOPIC_PATTERN_IDS))),
+            elements=len(_TOPIC_PATTERN_IDS),
+            flags=[hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH]
+                  * len(_TOPIC_PATTERN_IDS)
+        )
+        return database
+    except Exception as e:
+        logger.warning(f"Hyperscan topic database unavailable, using compiled regexes: {e}")
+        return None
+
+
+_TOPIC_DATABASE = _compile_topic_database()
+
+
+@lru_cache(maxsize=1)
+def _load_langdetect():
+    """Import langdetect on first use; returns (detect, LangDetectException) or None."""
+    if not LANGDETECT_AVAILABLE:
+        return None
+    try:
+        from langdetect import detect, DetectorFactory
+        from langdetect.lang_detect_exception import LangDetectException
+    except ImportError:
+        return None
+    DetectorFactory.seed = 0
+    return detect, LangDetectException
+
+
+@lru_cache(maxsize=1024)
+def _classify_financial_topic(text_lower: str) -> str:
+    """Score lowercased text against the topic patterns; cached since queries repeat."""
+    # Score each topic
+    topic_scores = {}
+    if _TOPIC_DATABASE is not None:
+        # Single pass over the text; SINGLEMATCH reports each pattern at most once
+        matched_ids = set()
+        _TOPIC_DATABASE.scan(
+            text_lower.encode('utf-8'),
+            match_event_handler=lambda pattern_id, *_: matched_ids.add(pattern_id)
+        )
+        for pattern_id in sorted(matched_ids):
+            topic = _TOPIC_PATTERN_IDS[pattern_id][0]
+            topic_scores[topic] = topic_scores.get(topic, 0) + 1
+    else:
+        for topic, patterns in _TOPIC_PATTERNS.items():
+            score = sum(1 for pattern in patterns if pattern.search(text_lower))
+            if score > 0:
+                topic_scores[topic] = score
+    
+    # Return highest scoring topic
+    if topic_scores:
+        return max(topic_scores.items(), key=lambda x: x[1])[0]
+    
+    return 'general'
+
 
 class ConversationalMemory:
     """Advanced memory system for maintaining conversation context."""
     
     def __init__(self, max_history: int = 50):
         self.max_history = max_history
-        self.conversation_history = []
+        # Bounded windows: the oldest entries drop off in O(1) once full
+        self.conversation_history = deque(maxlen=max_history)
         self.user_profile = {}
         self.topics_discussed = {}
-        self.sentiment_history = []
+        self.sentiment_history = deque(maxlen=max_history)
         self.learning_feedback = []
+        # Running total of response times over the stored history
+        self.total_response_time = 0.0
+        # Compound scores of the latest turns, kept for the sentiment trend
+        self.recent_compound_scores = deque(maxlen=3)
         
     def add_interaction(self, user_input: str, ai_response: str, metadata: Dict[str, Any]):
         """Add an interaction to memory."""
@@ -72,14 +550,15 @@ class ConversationalMemory:
             'topic': metadata.get('topic', 'general'),
             'sentiment': metadata.get('sentiment', 'neutral'),
             'confidence': metadata.get('confidence', 0.5),
+            'response_time': metadata.get('response_time', 0.0),
             'tokens_used': len(user_input.split()) + len(ai_response.split())
         }
         
+        # Maintain history limit; the deque evicts the oldest entry on append
+        if len(self.conversation_history) == self.max_history:
+            self.total_response_time -= self.conversation_history[0]['response_time']
         self.conversation_history.append(interaction)
-        
-        # Maintain history limit
-        if len(self.conversation_history) > self.max_history:
-            self.conversation_history.pop(0)
+        self.total_response_time += interaction['response_time']
         
         # Update topic tracking
         topic = interaction['topic']
@@ -92,13 +571,16 @@ class ConversationalMemory:
             'timestamp': interaction['timestamp'],
             'sentiment': interaction['sentiment']
         })
+        if isinstance(interaction['sentiment'], dict):
+            self.recent_compound_scores.append(interaction['sentiment'].get('compound', 0.0))
         
     def get_context(self, last_n: int = 5) -> str:
         """Get recent conversation context."""
         if not self.conversation_history:
             return ""
         
-        recent = self.conversation_history[-last_n:]
+        start = max(len(self.conversation_history) - last_n, 0)
+        recent = islice(self.conversation_history, start, None)
         context_parts = []
         
         for interaction in recent:
@@ -124,7 +606,7 @@ class ConversationalMemory:
     def _get_preferred_language(self) -> str:
         """Determine user's preferred language."""
         languages = [i['language'] for i in self.conversation_history]
-        return max(set(languages), key=languages.count) if languages else 'en'
+        return Counter(languages).most_common(1)[0][0] if languages else 'en'
     
     def _get_favorite_topics(self) -> List[str]:
         """Get user's most discussed topics."""
@@ -170,19 +652,200 @@ class ConversationalMemory:
             return 'beginner'
 
 
+class SemanticSearchCache:
+    """LRU cache of search results, matched by exact query text or embedding similarity.
+    
+    Entries expire after ttl seconds so documents added to the store reach later searches;
+    callers that can detect a store change should call clear() instead of waiting.
+    """
+    
+    def __init__(self, max_entries: int = 256, similarity_threshold: float = 0.95, ttl: float = 300):
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self._entries = OrderedDict()  # normalized query -> (stored_at, unit vector or None, documents)
+        self._matrix = None
+        self._matrix_keys = []
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _normalize(query: str) -> str:
+        return ' '.join(query.lower().split())
+    
+    def get(self, query: str) -> Optional[List[Any]]:
+        """Return cached documents for an identical (normalized) query, if any."""
+        key = self._normalize(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                self._matrix = None
+                return None
+            self._entries.move_to_end(key)
+            return list(entry[2])
+    
+    def get_similar(self, vector) -> Optional[List[Any]]:
+        """Return cached documents for the most similar embedded query above the threshold."""
+        if not NUMPY_AVAILABLE:
+            return None
+        
+        with self._lock:
+            self._drop_expired()
+            if self._matrix is None:
+                self._matrix_keys = [key for key, (_, unit, _) in self._entries.items() if unit is not None]
+                if not self._matrix_keys:
+                    return None
+                self._matrix = np.vstack([self._entries[key][1] for key in self._matrix_keys])
+            
+            similarities = self._matrix @ self._unit(vector)
+            best = int(similarities.argmax())
+            if similarities[best] < self.similarity_threshold:
+                return None
+            key = self._matrix_keys[best]
+            self._entries.move_to_end(key)
+            return list(self._entries[key][2])
+    
+    def put(self, query: str, vector, documents: List[Any]):
+        """Store documents for a query, evicting the least recently used entry when full."""
+        unit = self._unit(vector) if NUMPY_AVAILABLE and vector is not None else None
+        key = self._normalize(query)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), unit, list(documents))
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._matrix = None
+    
+    def clear(self):
+        """Drop every entry, e.g. after documents were added to the store."""
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+    
+    def _drop_expired(self):
+        """Remove entries older than ttl; the caller holds the lock."""
+        cutoff = time.monotonic() - self.ttl
+        expired = [key for key, (stored_at, _, _) in self._entries.items() if stored_at < cutoff]
+        for key in expired:
+            del self._entries[key]
+        if expired:
+            self._matrix = None
+    
+    @staticmethod
+    def _unit(vector):
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+
+# Embedding classes whose embed_query(q) equals embed_documents([q])[0] unless configured
+# with a query instruction or query-specific encode kwargs
+_SYMMETRIC_EMBEDDINGS = frozenset({'HuggingFaceEmbeddings', 'SentenceTransformerEmbeddings'})
+
+
+def _embeds_queries_as_documents(embeddings) -> bool:
+    """Whether queries may be embedded with one batched embed_documents call."""
+    return (type(embeddings).__name__ in _SYMMETRIC_EMBEDDINGS
+            and not getattr(embeddings, 'query_instruction', None)
+            and not getattr(embeddings, 'query_encode_kwargs', None))
+
+
+class SimilaritySearchBatcher:
+    """Coalesce concurrent similarity searches into batched vector-store calls."""
+    
+    def __init__(self, vector_store, k: int = 3):
+        self.vector_store = vector_store
+        self.k = k
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._batch_lock = threading.Lock()
+        self.cache = SemanticSearchCache()
+        self._store_size = self._current_store_size()
+        
+        # Batching needs a shared embedding model and search-by-vector support (e.g. FAISS)
+        embeddings = getattr(vector_store, 'embeddings', None)
+        self._embed_query = getattr(embeddings, 'embed_query', None)
+        # Asymmetric (instruction or query-prompt) models must embed each query with embed_query
+        self._embed_documents = (getattr(embeddings, 'embed_documents', None)
+                                 if _embeds_queries_as_documents(embeddings) else None)
+        self.batching_enabled = (
+            self._embed_query is not None
+            and hasattr(vector_store, 'similarity_search_by_vector')
+        )
+    
+    def search(self, query: str) -> List[Any]:
+        """Return the top-k documents for a query, sharing embedding work with concurrent callers."""
+        # Documents added to the shared store (e.g. by the paper fetcher) invalidate cached searches
+        store_size = self._current_store_size()
+        if store_size != self._store_size:
+            self._store_size = store_size
+            self.cache.clear()
+        
+        # Repeated questions skip embedding and search entirely
+        cached = self.cache.get(query)
+        if cached is not None:
+            return cached
+        
+        if not self.batching_enabled:
+            documents = self.vector_store.similarity_search(query, k=self.k)
+            self.cache.put(query, None, documents)
+            return documents
+        
+        slot = {'query': query, 'documents': [], 'done': False}
+        with self._pending_lock:
+            self._pending.append(slot)
+        
+        # Whoever holds the batch lock serves every request queued so far; a caller
+        # that was served while waiting for the lock returns without extra work.
+        # An idle system therefore pays no added latency.
+        with self._batch_lock:
+            if not slot['done']:
+                with self._pending_lock:
+                    batch, self._pending = self._pending, []
+                self._run_batch(batch)
+        
+        return slot['documents']
+    
+    def _current_store_size(self) -> Optional[int]:
+        """Number of vectors in the store when it exposes one (FAISS), else None."""
+        return getattr(getattr(self.vector_store, 'index', None), 'ntotal', None)
+    
+    def _run_batch(self, batch: List[Dict[str, Any]]):
+        """Embed all queued queries, in one call where the model allows it, and search each vector."""
+        try:
+            queries = [slot['query'] for slot in batch]
+            if self._embed_documents is not None:
+                vectors = self._embed_documents(queries)
+            else:
+                vectors = [self._embed_query(query) for query in queries]
+            for slot, vector in zip(batch, vectors):
+                # Near-duplicate questions reuse an earlier search
+                documents = self.cache.get_similar(vector)
+                if documents is None:
+                    documents = self.vector_store.similarity_search_by_vector(vector, k=self.k)
+                    self.cache.put(slot['query'], vector, documents)
+                slot['documents'] = documents
+        except Exception as e:
+            logger.error(f"Error in batched similarity search: {e}")
+        finally:
+            for slot in batch:
+                slot['done'] = True
+
+
 class AdvancedConversationalAgent:
     """Advanced conversational AI agent with human-like capabilities."""
     
     def __init__(self, vector_store, personality: str = "professional_friendly"):
         """Initialize the advanced conversational agent."""
         self.vector_store = vector_store
+        self.document_search = SimilaritySearchBatcher(vector_store, k=3)
         self.memory = ConversationalMemory()
         self.personality = personality
         self.session_id = str(uuid.uuid4())
         self.start_time = datetime.now()
-        
-        # Initialize NLP components
-        self._init_nlp_components()
+        self._start_monotonic = time.monotonic()
         
         # Load conversation patterns and responses
         self._init_conversation_patterns()
@@ -195,6 +858,9 @@ class AdvancedConversationalAgent:
         # Enhanced knowledge from papers
         self.learned_papers = []
         self.dynamic_concepts = {}
+        self._paper_title_sets = []
+        self._paper_summary_sets = []
+        self._paper_word_index = {}
         
         # Initialize enhanced knowledge
         self._initialize_enhanced_knowledge()
@@ -204,25 +870,31 @@ class AdvancedConversationalAgent:
         
         logger.info("🤖 Advanced Conversational Agent initialized")
     
-    def _init_nlp_components(self):
-        """Initialize NLP components."""
-        if NLTK_AVAILABLE:
+    @cached_property
+    def sentiment_analyzer(self):
+        """NLTK sentiment analyzer, loaded on first use; None when unavailable."""
+        if not NLTK_AVAILABLE:
+            return None
+        try:
+            import nltk
+            from nltk.sentiment import SentimentIntensityAnalyzer
+        except ImportError:
+            return None
+        
+        try:
+            # Download required NLTK data if not present
+            nltk.data.find('vader_lexicon')
+            return SentimentIntensityAnalyzer()
+        except LookupError:
             try:
-                # Download required NLTK data if not present
-                nltk.data.find('vader_lexicon')
-                self.sentiment_analyzer = SentimentIntensityAnalyzer()
-            except LookupError:
-                try:
-                    nltk.download('vader_lexicon', quiet=True)
-                    nltk.download('punkt', quiet=True)
-                    nltk.download('stopwords', quiet=True)
-                    self.sentiment_analyzer = SentimentIntensityAnalyzer()
-                except:
-                    self.sentiment_analyzer = None
+                nltk.download('vader_lexicon', quiet=True)
+                nltk.download('punkt', quiet=True)
+                nltk.download('stopwords', quiet=True)
+                return SentimentIntensityAnalyzer()
             except:
-                self.sentiment_analyzer = None
-        else:
-            self.sentiment_analyzer = None
+                return None
+        except:
+            return None
     
     def _init_conversation_patterns(self):
         """Initialize conversation patterns and responses."""
@@ -281,6 +953,18 @@ class AdvancedConversationalAgent:
             }
         }
         
+        # Compile patterns once; the combined trigger rejects most inputs in a single scan
+        self._compiled_conversation_patterns = [
+            (pattern_type, [re.compile(pattern, re.IGNORECASE) for pattern in pattern_data['patterns']])
+            for pattern_type, pattern_data in self.conversation_patterns.items()
+        ]
+        self._conversation_trigger = re.compile(
+            '|'.join(f'(?:{pattern})'
+                     for pattern_data in self.conversation_patterns.values()
+                     for pattern in pattern_data['patterns']),
+            re.IGNORECASE
+        )
+        
         # Personality traits
         self.personality_traits = {
             'professional_friendly': {
@@ -309,14 +993,16 @@ class AdvancedConversationalAgent:
         
         # Use conversation history for context
         if self.memory.conversation_history:
-            recent_language = self.memory.get_user_preferences().get('preferred_language', 'en')
+            recent_language = self.memory._get_preferred_language()
             
             # If very short text, use recent language preference
             if len(text_clean.split()) < 3:
                 return recent_language
         
         # Try langdetect first
-        if LANGDETECT_AVAILABLE and len(text_clean) > 10:
+        langdetect = _load_langdetect() if len(text_clean) > 10 else None
+        if langdetect:
+            detect, LangDetectException = langdetect
             try:
                 detected = detect(text_clean)
                 if detected in ['es', 'en']:
@@ -379,11 +1065,14 @@ class AdvancedConversationalAgent:
     
     def detect_conversation_pattern(self, text: str, language: str) -> Optional[str]:
         """Detect conversation patterns in user input."""
-        text_lower = text.lower()
-        
-        for pattern_type, pattern_data in self.conversation_patterns.items():
-            for pattern in pattern_data['patterns']:
-                if re.search(pattern, text_lower, re.IGNORECASE):
+        # The patterns are case-insensitive, so text needs no lowercasing here
+        # Most finance questions contain no trigger vocabulary at all
+        if not self._conversation_trigger.search(text):
+            return None
+        
+        for pattern_type, patterns in self._compiled_conversation_patterns:
+            for pattern in patterns:
+                if pattern.search(text):
                     return pattern_type
         
         return None
@@ -399,15 +1088,20 @@ class AdvancedConversationalAgent:
         Returns:
             Enhanced response with conversational capabilities
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         
         try:
+            # Normalize the input once; helpers below share these forms
+            text_lower = user_input.lower()
+            tokens = text_lower.split()
+            query_words = frozenset(tokens)
+            
             # Detect language and sentiment
             detected_lang = self.detect_language(user_input)
             sentiment = self.analyze_sentiment(user_input)
             
             # Detect conversation patterns
-            conversation_pattern = self.detect_conversation_pattern(user_input, detected_lang)
+            conversation_pattern = self.detect_conversation_pattern(text_lower, detected_lang)
             
             # Get conversation context
             conversation_context = self.memory.get_context(last_n=3)
@@ -419,15 +1113,16 @@ class AdvancedConversationalAgent:
                 topic = conversation_pattern
             else:
                 # Identify financial topic
-                topic = self._identify_financial_topic(user_input, detected_lang)
+                topic = self._identify_financial_topic(text_lower, detected_lang)
                 
                 # Generate contextual financial response
                 response = self._generate_contextual_response(
-                    user_input, detected_lang, topic, conversation_context, user_preferences, sentiment
+                    user_input, detected_lang, topic, conversation_context, user_preferences, sentiment,
+                    query_words
                 )
             
             # Calculate response time
-            response_time = (datetime.now() - start_time).total_seconds()
+            response_time = time.perf_counter() - start_time
             
             # Prepare metadata
             metadata = {
@@ -440,7 +1135,7 @@ class AdvancedConversationalAgent:
                 'user_preferences': user_preferences,
                 'conversation_length': len(self.memory.conversation_history),
                 'papers_integrated': len(self.learned_papers),
-                'confidence': self._calculate_response_confidence(user_input, topic, conversation_pattern)
+                'confidence': self._calculate_response_confidence(tokens, topic, conversation_pattern)
             }
             
             # Add to memory
@@ -475,450 +1170,121 @@ class AdvancedConversationalAgent:
             # Personalize based on preferences
             if preferences.get('favorite_topics'):
                 topic = preferences['favorite_topics'][0]
-                if language == 'es':
-                    base_response += f" ¿Te gustaría continuar explorando {topic}?"
-                else:
-                    base_response += f" Would you like to continue exploring {topic}?"
-            
-            return base_response
-        
-        # Fallback response
-        if language == 'es':
-            return "¡Gracias por tu mensaje! ¿En qué puedo ayudarte con finanzas cuantitativas?"
-        else:
-            return "Thank you for your message! How can I help you with quantitative finance?"
-    
-    def _generate_contextual_response(self, user_input: str, language: str, topic: str, 
-                                    context: str, preferences: Dict[str, Any], 
-                                    sentiment: Dict[str, float]) -> str:
-        """Generate contextually aware response."""
-        
-        # Get base financial response
-        if topic and hasattr(self, f'_get_{topic}_response'):
-            response_method = getattr(self, f'_get_{topic}_response')
-            base_response = response_method(user_input, language, preferences)
-        else:
-            base_response = self._get_general_response(user_input, language, preferences)
-        
-        # Add conversational elements
-        conversational_response = self._add_conversational_elements(
-            base_response, language, preferences, sentiment, context
-        )
-        
-        # Add recent papers if relevant
-        enhanced_response = self._enhance_with_recent_papers(
-            conversational_response, user_input, language
-        )
-        
-        return enhanced_response
-    
-    def _add_conversational_elements(self, base_response: str, language: str, 
-                                   preferences: Dict[str, Any], sentiment: Dict[str, float],
-                                   context: str) -> str:
-        """Add conversational elements to make response more human-like."""
-        
-        # Analyze user's complexity preference
-        complexity = preferences.get('complexity_level', 'intermediate')
-        interaction_style = preferences.get('interaction_style', 'moderate')
-        
-        # Add personality-based intro
-        if sentiment['compound'] > 0.5:  # User seems positive/excited
-            if language == 'es':
-                intro = "¡Me alegra tu entusiasmo! "
-            else:
-                intro = "I love your enthusiasm! "
-        elif sentiment['compound'] < -0.3:  # User seems confused/frustrated
-            if language == 'es':
-                intro = "Entiendo que esto puede ser desafiante. "
-            else:
-                intro = "I understand this can be challenging. "
-        else:
-            intro = ""
-        
-        # Add context reference if available
-        context_ref = ""
-        if context and len(self.memory.conversation_history) > 1:
-            if language == 'es':
-                context_ref = "Continuando nuestra conversación, "
-            else:
-                context_ref = "Building on our discussion, "
-        
-        # Adjust complexity based on preferences
-        if complexity == 'beginner' and 'mathematical' in base_response.lower():
-            if language == 'es':
-                complexity_note = "\n\n💡 *Nota: Puedo explicar esto de manera más simple si lo prefieres.*"
-            else:
-                complexity_note = "\n\n💡 *Note: I can explain this more simply if you prefer.*"
-        elif complexity == 'advanced' and len(base_response) < 500:
-            if language == 'es':
-                complexity_note = "\n\n🔬 *¿Te gustaría una explicación más técnica y detallada?*"
-            else:
-                complexity_note = "\n\n🔬 *Would you like a more technical and detailed explanation?*"
-        else:
-            complexity_note = ""
-        
-        # Add follow-up question
-        if language == 'es':
-            follow_up = "\n\n❓ ¿Hay algún aspecto específico que te gustaría explorar más a fondo?"
-        else:
-            follow_up = "\n\n❓ Is there any specific aspect you'd like to explore further?"
-        
-        return intro + context_ref + base_response + complexity_note + follow_up
-    
-    def _get_black_scholes_response(self, user_input: str, language: str, preferences: Dict[str, Any]) -> str:
-        """Get Black-Scholes response adapted to conversation."""
-        if language == 'es':
-            return """
-## 📈 El Modelo Black-Scholes
-
-El modelo Black-Scholes es fundamental en finanzas cuantitativas para valorar opciones europeas.
-
-### 🎯 Fórmula Principal:
-**C = S₀ × N(d₁) - K × e^(-rT) × N(d₂)**
-
-### 🔑 Variables Clave:
-- **S₀**: Precio actual del activo
-- **K**: Precio de ejercicio  
-- **r**: Tasa libre de riesgo
-- **T**: Tiempo hasta vencimiento
-- **σ**: Volatilidad del activo
-
-### 💡 Intuición:
-El modelo calcula el valor presente esperado del payoff de la opción bajo medida neutral al riesgo.
-
-### ⚙️ Supuestos Importantes:
-1. Volatilidad constante
-2. Tasa de interés constante
-3. No hay dividendos
-4. Mercados eficientes
-
-### 🎪 Las "Griegas":
-- **Delta (Δ)**: Sensibilidad al precio del subyacente
-- **Gamma (Γ)**: Convexidad del delta
-- **Theta (Θ)**: Decaimiento temporal
-- **Vega (ν)**: Sensibilidad a la volatilidad
-            """
-        else:
-            return """
-## 📈 The Black-Scholes Model
-
-The Black-Scholes model is fundamental in quantitative finance for valuing European options.
-
-### 🎯 Core Formula:
-**C = S₀ × N(d₁) - K × e^(-rT) × N(d₂)**
-
-### 🔑 Key Variables:
-- **S₀**: Current asset price
-- **K**: Strike price
-- **r**: Risk-free rate
-- **T**: Time to expiration
-- **σ**: Asset volatility
-
-### 💡 Intuition:
-The model calculates the expected present value of the option's payoff under risk-neutral measure.
-
-### ⚙️ Key Assumptions:
-1. Constant volatility
-2. Constant interest rate
-3. No dividends
-4. Efficient markets
-
-### 🎪 The "Greeks":
-- **Delta (Δ)**: Sensitivity to underlying price
-- **Gamma (Γ)**: Delta convexity
-- **Theta (Θ)**: Time decay
-- **Vega (ν)**: Volatility sensitivity
-            """
-    
-    def _get_var_response(self, user_input: str, language: str, preferences: Dict[str, Any]) -> str:
-        """Get VaR response adapted to conversation."""
-        if language == 'es':
-            return """
-## ⚠️ Value at Risk (VaR)
-
-El VaR es una medida estadística que cuantifica el riesgo financiero potencial.
-
-### 🎯 Definición:
-**"Hay una probabilidad X% de que las pérdidas no excedan $Y en Z días"**
-
-### 📊 Métodos de Cálculo:
-
-#### 1. **Método Paramétrico**
-- Asume normalidad de retornos
-- VaR = μ - Z_α × σ × √t
-- Rápido pero limitado
-
-#### 2. **Simulación Histórica**
-- Usa datos reales del pasado
-- No asume distribución específica
-- Captura mejor las colas pesadas
-
-#### 3. **Monte Carlo**
-- Simula miles de escenarios
-- Muy flexible y preciso
-- Computacionalmente intensivo
-
-### 💼 Aplicaciones Prácticas:
-- Límites de riesgo
-- Requerimientos de capital
-- Informes regulatorios
-- Gestión de portafolios
-            """
-        else:
-            return """
-## ⚠️ Value at Risk (VaR)
-
-VaR is a statistical measure that quantifies potential financial risk.
-
-### 🎯 Definition:
-**"There is an X% probability that losses will not exceed $Y over Z days"**
-
-### 📊 Calculation Methods:
-
-#### 1. **Parametric Method**
-- Assumes return normality
-- VaR = μ - Z_α × σ × √t
-- Fast but limited
-
-#### 2. **Historical Simulation**
-- Uses actual past data
-- No specific distribution assumption
-- Better captures fat tails
-
-#### 3. **Monte Carlo**
-- Simulates thousands of scenarios
-- Very flexible and accurate
-- Computationally intensive
-
-### 💼 Practical Applications:
-- Risk limits
-- Capital requirements
-- Regulatory reporting
-- Portfolio management
-            """
-    
-    def _get_portfolio_response(self, user_input: str, language: str, preferences: Dict[str, Any]) -> str:
-        """Get portfolio optimization response adapted to conversation."""
+                if language == 'es':
+                    base_response += f" ¿Te gustaría continuar explorando {topic}?"
+                else:
+                    base_response += f" Would you like to continue exploring {topic}?"
+            
+            return base_response
+        
+        # Fallback response
         if language == 'es':
-            return """
-## 📊 Optimización de Portafolios (Markowitz)
-
-La teoría moderna de portafolios busca maximizar retorno por unidad de riesgo.
-
-### 🎯 Objetivo:
-Encontrar la combinación óptima de activos que maximice la utilidad del inversor.
-
-### 🔢 Formulación Matemática:
-- **Retorno**: E(Rp) = Σ wi × E(Ri)
-- **Riesgo**: σp² = Σ Σ wi × wj × σij
-
-### 📈 Frontera Eficiente:
-Conjunto de portafolios que ofrecen:
-- Máximo retorno para un nivel de riesgo dado
-- Mínimo riesgo para un nivel de retorno dado
-
-### ⚙️ Proceso de Optimización:
-1. Estimar retornos esperados
-2. Calcular matriz de covarianzas
-3. Resolver problema de optimización
-4. Construir frontera eficiente
-
-### 🎪 Ratio de Sharpe:
-**S = (E(Rp) - Rf) / σp**
-
-Mide el retorno excesivo por unidad de riesgo.
-            """
+            return "¡Gracias por tu mensaje! ¿En qué puedo ayudarte con finanzas cuantitativas?"
         else:
-            return """
-## 📊 Portfolio Optimization (Markowitz)
-
-Modern portfolio theory seeks to maximize return per unit of risk.
-
-### 🎯 Objective:
-Find the optimal combination of assets that maximizes investor utility.
-
-### 🔢 Mathematical Formulation:
-- **Return**: E(Rp) = Σ wi × E(Ri)
-- **Risk**: σp² = Σ Σ wi × wj × σij
-
-### 📈 Efficient Frontier:
-Set of portfolios offering:
-- Maximum return for given risk level
-- Minimum risk for given return level
-
-### ⚙️ Optimization Process:
-1. Estimate expected returns
-2. Calculate covariance matrix
-3. Solve optimization problem
-4. Construct efficient frontier
-
-### 🎪 Sharpe Ratio:
-**S = (E(Rp) - Rf) / σp**
-
-Measures excess return per unit of risk.
-            """
+            return "Thank you for your message! How can I help you with quantitative finance?"
     
-    def _get_general_response(self, user_input: str, language: str, preferences: Dict[str, Any]) -> str:
-        """Generate general conversational response."""
+    def _generate_contextual_response(self, user_input: str, language: str, topic: str, 
+                                    context: str, preferences: Dict[str, Any], 
+                                    sentiment: Dict[str, float], query_words: frozenset) -> str:
+        """Generate contextually aware response."""
+        
+        # Get base financial response
+        if topic and hasattr(self, f'_get_{topic}_response'):
+            response_method = getattr(self, f'_get_{topic}_response')
+            base_response = response_method(user_input, language, preferences)
+        else:
+            base_response = self._get_general_response(user_input, language, preferences)
+        
+        # Add conversational elements
+        conversational_response = self._add_conversational_elements(
+            base_response, language, preferences, sentiment, context
+        )
+        
+        # Add recent papers if relevant
+        enhanced_response = self._enhance_with_recent_papers(
+            conversational_response, query_words, language
+        )
+        
+        return enhanced_response
+    
+    def _add_conversational_elements(self, base_response: str, language: str, 
+                                   preferences: Dict[str, Any], sentiment: Dict[str, float],
+                                   context: str) -> str:
+        """Add conversational elements to make response more human-like."""
+        
+        # Analyze user's complexity preference
         complexity = preferences.get('complexity_level', 'intermediate')
+        interaction_style = preferences.get('interaction_style', 'moderate')
         
-        if language == 'es':
-            if complexity == 'beginner':
-                return f"""
-## 💼 Análisis de Finanzas Cuantitativas
-
-Basándome en tu pregunta sobre "{user_input[:50]}...", aquí tienes una explicación accesible:
-
-### 🔍 Contexto:
-Las finanzas cuantitativas utilizan matemáticas y estadística para entender los mercados financieros.
-
-### 📊 Conceptos Clave:
-• **Riesgo**: La incertidumbre en los retornos de inversión
-• **Retorno**: Las ganancias o pérdidas de una inversión
-• **Diversificación**: Reducir riesgo invirtiendo en múltiples activos
-• **Valoración**: Determinar el precio justo de un activo
-
-### 🚀 Aplicaciones Prácticas:
-1. Valoración de inversiones
-2. Gestión de riesgos
-3. Optimización de portafolios
-4. Trading algorítmico
-
-### 💡 Consejo:
-Comienza con los conceptos básicos antes de avanzar a modelos más complejos.
-                """
+        # Add personality-based intro
+        if sentiment['compound'] > 0.5:  # User seems positive/excited
+            if language == 'es':
+                intro = "¡Me alegra tu entusiasmo! "
             else:
-                return f"""
-## 💼 Análisis Avanzado de Finanzas Cuantitativas
-
-Examinando tu consulta sobre "{user_input[:50]}...", proporciono un análisis detallado:
-
-### 🔬 Marco Teórico:
-Las finanzas cuantitativas integran:
-- Procesos estocásticos
-- Teoría de probabilidades
-- Optimización matemática
-- Análisis estadístico
-
-### 📈 Metodologías Aplicables:
-• **Modelos de Valoración**: Black-Scholes, Binomial, Monte Carlo
-• **Gestión de Riesgos**: VaR, Expected Shortfall, Stress Testing
-• **Optimización**: Markowitz, Black-Litterman, Risk Parity
-• **Econometría**: GARCH, VAR, Cointegración
-
-### 🎯 Consideraciones Implementación:
-1. Calidad y disponibilidad de datos
-2. Supuestos del modelo y limitaciones
-3. Validación y backtesting
-4. Aspectos computacionales
-
-### 🔄 Desarrollos Recientes:
-Machine learning, factor investing, ESG integration, crypto assets.
-                """
+                intro = "I love your enthusiasm! "
+        elif sentiment['compound'] < -0.3:  # User seems confused/frustrated
+            if language == 'es':
+                intro = "Entiendo que esto puede ser desafiante. "
+            else:
+                intro = "I understand this can be challenging. "
         else:
-            if complexity == 'beginner':
-                return f"""
-## 💼 Quantitative Finance Analysis
-
-Based on your question about "{user_input[:50]}...", here's an accessible explanation:
-
-### 🔍 Context:
-Quantitative finance uses mathematics and statistics to understand financial markets.
-
-### 📊 Key Concepts:
-• **Risk**: Uncertainty in investment returns
-• **Return**: Gains or losses from an investment
-• **Diversification**: Reducing risk by investing in multiple assets
-• **Valuation**: Determining the fair price of an asset
-
-### 🚀 Practical Applications:
-1. Investment valuation
-2. Risk management
-3. Portfolio optimization
-4. Algorithmic trading
-
-### 💡 Tip:
-Start with basic concepts before advancing to more complex models.
-                """
+            intro = ""
+        
+        # Add context reference if available
+        context_ref = ""
+        if context and len(self.memory.conversation_history) > 1:
+            if language == 'es':
+                context_ref = "Continuando nuestra conversación, "
             else:
-                return f"""
-## 💼 Advanced Quantitative Finance Analysis
-
-Examining your query about "{user_input[:50]}...", I provide a detailed analysis:
-
-### 🔬 Theoretical Framework:
-Quantitative finance integrates:
-- Stochastic processes
-- Probability theory
-- Mathematical optimization
-- Statistical analysis
-
-### 📈 Applicable Methodologies:
-• **Valuation Models**: Black-Scholes, Binomial, Monte Carlo
-• **Risk Management**: VaR, Expected Shortfall, Stress Testing
-• **Optimization**: Markowitz, Black-Litterman, Risk Parity
-• **Econometrics**: GARCH, VAR, Cointegration
-
-### 🎯 Implementation Considerations:
-1. Data quality and availability
-2. Model assumptions and limitations
-3. Validation and backtesting
-4. Computational aspects
-
-### 🔄 Recent Developments:
-Machine learning, factor investing, ESG integration, crypto assets.
-                """
-    
-    def _identify_financial_topic(self, text: str, language: str) -> str:
-        """Identify financial topic with enhanced pattern matching."""
-        text_lower = text.lower()
+                context_ref = "Building on our discussion, "
         
-        # Enhanced topic patterns
-        topic_patterns = {
-            'black_scholes': [
-                r'black.scholes', r'option.pricing', r'european.option',
-                r'bs.model', r'greeks', r'delta.hedging'
-            ],
-            'var': [
-                r'value.at.risk', r'var\b', r'risk.measure', r'quantile',
-                r'expected.shortfall', r'conditional.var', r'riesgo'
-            ],
-            'portfolio': [
-                r'portfolio', r'markowitz', r'efficient.frontier',
-                r'asset.allocation', r'diversification', r'portafolio'
-            ],
-            'derivatives': [
-                r'derivative', r'option', r'future', r'forward', r'swap',
-                r'exotic', r'american.option', r'derivado'
-            ],
-            'monte_carlo': [
-                r'monte.carlo', r'simulation', r'random.sampling',
-                r'path.dependent', r'numerical.method', r'simulación'
-            ],
-            'trading': [
-                r'algorithmic.trading', r'high.frequency', r'market.making',
-                r'execution', r'trading.strategy', r'arbitrage'
-            ],
-            'risk_management': [
-                r'risk.management', r'stress.test', r'scenario.analysis',
-                r'credit.risk', r'market.risk', r'gestión.riesgo'
-            ]
-        }
+        # Adjust complexity based on preferences
+        if complexity == 'beginner' and 'mathematical' in base_response.lower():
+            if language == 'es':
+                complexity_note = "\n\n💡 *Nota: Puedo explicar esto de manera más simple si lo prefieres.*"
+            else:
+                complexity_note = "\n\n💡 *Note: I can explain this more simply if you prefer.*"
+        elif complexity == 'advanced' and len(base_response) < 500:
+            if language == 'es':
+                complexity_note = "\n\n🔬 *¿Te gustaría una explicación más técnica y detallada?*"
+            else:
+                complexity_note = "\n\n🔬 *Would you like a more technical and detailed explanation?*"
+        else:
+            complexity_note = ""
         
-        # Score each topic
-        topic_scores = {}
-        for topic, patterns in topic_patterns.items():
-            score = sum(1 for pattern in patterns if re.search(pattern, text_lower))
-            if score > 0:
-                topic_scores[topic] = score
+        # Add follow-up question
+        if language == 'es':
+            follow_up = "\n\n❓ ¿Hay algún aspecto específico que te gustaría explorar más a fondo?"
+        else:
+            follow_up = "\n\n❓ Is there any specific aspect you'd like to explore further?"
         
-        # Return highest scoring topic
-        if topic_scores:
-            return max(topic_scores.items(), key=lambda x: x[1])[0]
+        return intro + context_ref + base_response + complexity_note + follow_up
+    
+    def _get_black_scholes_response(self, user_input: str, language: str, preferences: Dict[str, Any]) -> str:
+        """Get Black-Scholes response adapted to conversation."""
+        language = 'es' if language == 'es' else 'en'
+        return _TOPIC_RESPONSES['black_scholes'][language] + "\n" + _black_scholes_example(language)
+    
+    def _get_var_response(self, user_input: str, language: str, preferences: Dict[str, Any]) -> str:
+        """Get VaR response adapted to conversation."""
+        return _TOPIC_RESPONSES['var']['es' if language == 'es' else 'en']
+    
+    def _get_portfolio_response(self, user_input: str, language: str, preferences: Dict[str, Any]) -> str:
+        """Get portfolio optimization response adapted to conversation."""
+        return _TOPIC_RESPONSES['portfolio']['es' if language == 'es' else 'en']
+    
+    def _get_general_response(self, user_input: str, language: str, preferences: Dict[str, Any]) -> str:
+        """Generate general conversational response."""
+        complexity = preferences.get('complexity_level', 'intermediate')
         
-        return 'general'
+        key = ('es' if language == 'es' else 'en', 'beginner' if complexity == 'beginner' else 'advanced')
+        return _GENERAL_TEMPLATES[key].format(snippet=user_input[:50])
     
-    def _calculate_response_confidence(self, user_input: str, topic: str, pattern: str) -> float:
+    def _identify_financial_topic(self, text_lower: str, language: str) -> str:
+        """Identify financial topic of already-lowercased text with enhanced pattern matching."""
+        return _classify_financial_topic(text_lower)
+    
+    def _calculate_response_confidence(self, tokens: List[str], topic: str, pattern: str) -> float:
         """Calculate confidence in response quality."""
         confidence = 0.5  # Base confidence
         
@@ -931,7 +1297,7 @@ Machine learning, factor investing, ESG integration, crypto assets.
             confidence += 0.2
         
         # Increase confidence based on input clarity
-        input_length = len(user_input.split())
+        input_length = len(tokens)
         if input_length > 5:
             confidence += 0.1
         if input_length > 10:
@@ -943,55 +1309,54 @@ Machine learning, factor investing, ESG integration, crypto assets.
     def _get_relevant_documents(self, user_input: str) -> List[Any]:
         """Get relevant documents from vector store."""
         try:
-            return self.vector_store.similarity_search(user_input, k=3)
+            return self.document_search.search(user_input)
         except:
             return []
     
-    def _enhance_with_recent_papers(self, response: str, user_input: str, language: str) -> str:
+    def _enhance_with_recent_papers(self, response: str, query_words: frozenset, language: str) -> str:
         """Enhance response with relevant recent papers."""
-        if not self.learned_papers:
+        if not self._paper_word_index:
             return response
         
-        # Find relevant papers
+        # Find relevant papers; only papers sharing a word with the query are scored
         relevant_papers = []
-        query_words = set(user_input.lower().split())
+        candidates = set()
+        for word in query_words:
+            candidates.update(self._paper_word_index.get(word, ()))
         
-        for paper in self.learned_papers[:5]:
-            title_words = set(paper.get('title', '').lower().split())
-            summary_words = set(paper.get('summary', '').lower().split())
-            
+        # Common case: no query word appears in any paper
+        if not candidates:
+            return response
+        
+        for index in sorted(candidates):
             # Calculate relevance score
-            title_overlap = len(query_words.intersection(title_words))
-            summary_overlap = len(query_words.intersection(summary_words))
-            
-            if title_overlap > 0 or summary_overlap > 0:
-                relevant_papers.append({
-                    'paper': paper,
-                    'relevance': title_overlap * 2 + summary_overlap
-                })
-        
-        if relevant_papers:
-            # Sort by relevance
-            relevant_papers.sort(key=lambda x: x['relevance'], reverse=True)
-            
-            if language == 'es':
-                papers_section = f"\n\n## 📚 Investigación Reciente Relacionada:\n\n"
-                for i, item in enumerate(relevant_papers[:2], 1):
-                    paper = item['paper']
-                    title = paper.get('title', 'Sin título')[:80]
-                    authors = ', '.join(paper.get('authors', [])[:2])
-                    papers_section += f"**{i}.** {title}...\n   *Autores: {authors}*\n\n"
-            else:
-                papers_section = f"\n\n## 📚 Related Recent Research:\n\n"
-                for i, item in enumerate(relevant_papers[:2], 1):
-                    paper = item['paper']
-                    title = paper.get('title', 'Untitled')[:80]
-                    authors = ', '.join(paper.get('authors', [])[:2])
-                    papers_section += f"**{i}.** {title}...\n   *Authors: {authors}*\n\n"
+            title_overlap = len(query_words & self._paper_title_sets[index])
+            summary_overlap = len(query_words & self._paper_summary_sets[index])
             
-            response += papers_section
+            relevant_papers.append({
+                'paper': self.learned_papers[index],
+                'relevance': title_overlap * 2 + summary_overlap
+            })
         
-        return response
+        # Sort by relevance
+        relevant_papers.sort(key=lambda x: x['relevance'], reverse=True)
+        
+        if language == 'es':
+            parts = ["\n\n## 📚 Investigación Reciente Relacionada:\n\n"]
+            for i, item in enumerate(relevant_papers[:2], 1):
+                paper = item['paper']
+                title = paper.get('title', 'Sin título')[:80]
+                authors = ', '.join(paper.get('authors', [])[:2])
+                parts.append(f"**{i}.** {title}...\n   *Autores: {authors}*\n\n")
+        else:
+            parts = ["\n\n## 📚 Related Recent Research:\n\n"]
+            for i, item in enumerate(relevant_papers[:2], 1):
+                paper = item['paper']
+                title = paper.get('title', 'Untitled')[:80]
+                authors = ', '.join(paper.get('authors', [])[:2])
+                parts.append(f"**{i}.** {title}...\n   *Authors: {authors}*\n\n")
+        
+        return response + "".join(parts)
     
     def _get_error_response(self, language: str) -> str:
         """Get error response in appropriate language."""
@@ -1049,32 +1414,37 @@ What topic would you like to discuss?
         if rating <= 2:
             logger.warning(f"Low rating feedback: {comment}")
     
+    def session_seconds(self) -> float:
+        """Seconds elapsed since the session started, from a monotonic clock."""
+        return time.monotonic() - self._start_monotonic
+    
     def get_conversation_summary(self) -> Dict[str, Any]:
         """Get summary of current conversation session."""
         if not self.memory.conversation_history:
             return {'message': 'No conversation history available'}
         
         preferences = self.memory.get_user_preferences()
+        elapsed = self.session_seconds()
         
         return {
             'session_id': self.session_id,
-            'duration': str(datetime.now() - self.start_time),
+            'duration': str(timedelta(seconds=elapsed)),
+            'duration_seconds': elapsed,
             'total_interactions': len(self.memory.conversation_history),
             'languages_used': list(set(i['language'] for i in self.memory.conversation_history)),
             'topics_discussed': list(self.memory.topics_discussed.keys()),
             'user_preferences': preferences,
-            'avg_response_time': sum(i.get('metadata', {}).get('response_time', 0) 
-                                   for i in self.memory.conversation_history) / len(self.memory.conversation_history),
+            'avg_response_time': self.memory.total_response_time / len(self.memory.conversation_history),
             'sentiment_trend': self._analyze_sentiment_trend()
         }
     
     def _analyze_sentiment_trend(self) -> str:
         """Analyze sentiment trend over conversation."""
-        if len(self.memory.sentiment_history) < 2:
+        recent_scores = self.memory.recent_compound_scores
+        if len(recent_scores) < 2:
             return 'neutral'
         
-        recent_sentiments = [s['sentiment']['compound'] for s in self.memory.sentiment_history[-3:]]
-        avg_sentiment = sum(recent_sentiments) / len(recent_sentiments)
+        avg_sentiment = sum(recent_scores) / len(recent_scores)
         
         if avg_sentiment > 0.3:
             return 'positive'
@@ -1096,24 +1466,46 @@ What topic would you like to discuss?
             return
         
         try:
-            paper_files = list(papers_dir.glob("papers_*.json"))
+            # scandir entries carry cached stat data, avoiding a stat call per file
+            with os.scandir(papers_dir) as entries:
+                paper_files = [e for e in entries
+                               if e.name.startswith("papers_") and e.name.endswith(".json")]
             if not paper_files:
                 return
             
-            latest_file = max(paper_files, key=lambda x: x.stat().st_mtime)
+            latest_file = Path(max(paper_files, key=lambda e: e.stat().st_mtime).path)
             
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                papers = json.load(f)
+            if ORJSON_AVAILABLE:
+                papers = orjson.loads(latest_file.read_bytes())
+            else:
+                with open(latest_file, 'r', encoding='utf-8') as f:
+                    papers = json.load(f)
             
             self.learned_papers = papers[:20]  # Keep recent 20 papers
+            self._index_learned_papers()
             
             logger.info(f"🚀 Integrated {len(papers)} papers into conversational knowledge")
             
         except Exception as e:
             logger.error(f"Error integrating papers: {e}")
     
+    def _index_learned_papers(self):
+        """Precompute word sets and an inverted index for paper relevance scoring."""
+        # Only the first papers are considered when enhancing responses
+        papers = self.learned_papers[:5]
+        self._paper_title_sets = [frozenset(p.get('title', '').lower().split()) for p in papers]
+        self._paper_summary_sets = [frozenset(p.get('summary', '').lower().split()) for p in papers]
+        
+        word_index = defaultdict(list)
+        for index, (title_words, summary_words) in enumerate(zip(self._paper_title_sets,
+                                                                 self._paper_summary_sets)):
+            for word in title_words | summary_words:
+                word_index[word].append(index)
+        self._paper_word_index = dict(word_index)
+    
     def health_check(self) -> Dict[str, Any]:
         """Enhanced health check with conversational metrics."""
+        elapsed = self.session_seconds()
         base_health = {
             'overall_healthy': True,
             'vector_store': self.vector_store is not None,
@@ -1127,9 +1519,12 @@ What topic would you like to discuss?
             'conversation_active': len(self.memory.conversation_history) > 0,
             'languages_supported': ['Spanish (es)', 'English (en)'],
             'conversation_length': len(self.memory.conversation_history),
-            'session_duration': str(datetime.now() - self.start_time),
+            'session_duration': str(timedelta(seconds=elapsed)),
+            'session_duration_seconds': elapsed,
             'nlp_components': {
-                'sentiment_analysis': self.sentiment_analyzer is not None,
+                # Report availability without forcing the analyzer to load
+                'sentiment_analysis': (self.__dict__['sentiment_analyzer'] is not None
+                                       if 'sentiment_analyzer' in self.__dict__ else NLTK_AVAILABLE),
                 'language_detection': LANGDETECT_AVAILABLE,
                 'conversation_patterns': len(self.conversation_patterns)
             },
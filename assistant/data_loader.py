@@ -5,63 +5,146 @@ import pdfplumber
 import re
 import tempfile
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Optional
-import time
 
-def get_arxiv_papers(query: str, max_results: int = 10) -> List[Dict]:
+# Fast HTML parsing; BeautifulSoup remains the fallback
+try:
+    from selectolax.parser import HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# Shared session so repeated downloads reuse pooled keep-alive connections
+_session = requests.Session()
+
+# Precompiled cleaning helpers for clean_text
+_WHITESPACE_RE = re.compile(r"\s+")
+_ASCII_CONTROL_TABLE = dict.fromkeys([*range(0x20), 0x7F])
+
+# PDFs with fewer pages than this are parsed inline; a process pool is not worth its startup cost
+PARALLEL_PDF_MIN_PAGES = 8
+
+@lru_cache(maxsize=128)
+def _fetch_arxiv_papers(query: str, max_results: int) -> tuple:
     """
-    Fetch papers from ArXiv and return metadata.
+    Fetch papers from ArXiv once per (query, max_results) for the lifetime of the process.
     Args:
         query (str): Search query for ArXiv.
         max_results (int): Maximum number of results to fetch.
     Returns:
-        List[Dict]: List of paper metadata dictionaries.
+        tuple: Paper metadata dictionaries; callers must copy before mutating.
     """
-    client = arxiv.Client()
+    # The client paces its own page requests, so results need no extra sleeps
+    client = arxiv.Client(page_size=max_results, delay_seconds=3, num_retries=3)
     search = arxiv.Search(
         query=query,
         max_results=max_results,
         sort_by=arxiv.SortCriterion.Relevance
     )
-    papers = []
-    for result in client.results(search):
-        papers.append({
+    return tuple(
+        {
             "title": result.title,
             "authors": [author.name for author in result.authors],
             "summary": result.summary,
             "pdf_url": result.pdf_url,
             "published": result.published
-        })
-        time.sleep(1)  # Be respectful of ArXiv API
-    return papers
+        }
+        for result in client.results(search)
+    )
 
-def extract_text_from_pdf(url: str) -> str:
+def get_arxiv_papers(query: str, max_results: int = 10) -> List[Dict]:
+    """
+    Fetch papers from ArXiv and return metadata.
+    Args:
+        query (str): Search query for ArXiv.
+        max_results (int): Maximum number of results to fetch.
+    Returns:
+        List[Dict]: List of paper metadata dictionaries.
+    """
+    # Repeated searches are served from the cache; copies keep cached entries intact
+    return [{**paper, "authors": list(paper["authors"])}
+            for paper in _fetch_arxiv_papers(query, max_results)]
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    """
+    Extract text from a contiguous range of pages of a local PDF.
+    Args:
+        file_path (str): Path to the local PDF file.
+        start (int): Index of the first page to extract.
+        stop (int): Index one past the last page to extract.
+    Returns:
+        List[str]: Non-empty page texts, in page order.
+    """
+    text = []
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages[start:stop]:
+            page_text = page.extract_text()
+            if page_text:
+                text.append(page_text)
+    return text
+
+def _extract_pdf_text(file_path: str, parallel_pages: bool = True) -> str:
+    """
+    Extract text from a local PDF, spreading page parsing across processes for long documents.
+    Args:
+        file_path (str): Path to the local PDF file.
+        parallel_pages (bool): Whether long documents may use a process pool.
+    Returns:
+        str: Extracted text from the PDF.
+    """
+    with pdfplumber.open(file_path) as pdf:
+        n_pages = len(pdf.pages)
+    workers = min(os.cpu_count() or 1, n_pages)
+    if not parallel_pages or n_pages < PARALLEL_PDF_MIN_PAGES or workers < 2:
+        return " ".join(_extract_page_range(file_path, 0, n_pages))
+    # One contiguous slice per worker so each process opens the file only once
+    bounds = [n_pages * i // workers for i in range(workers + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = executor.map(_extract_page_range, [file_path] * workers, bounds[:-1], bounds[1:])
+        return " ".join(page for chunk in chunks for page in chunk)
+
+def extract_text_from_pdf(url: str, parallel_pages: bool = True) -> str:
     """
     Extract text from a PDF at a given URL.
     Args:
         url (str): URL to the PDF file.
+        parallel_pages (bool): Whether long documents may use a process pool.
     Returns:
         str: Extracted text from the PDF, or empty string on failure.
     """
+    tmp_path = None
     try:
-        response = requests.get(url, stream=True, timeout=20)
+        response = _session.get(url, stream=True, timeout=20)
         response.raise_for_status()
         with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            for chunk in response.iter_content(chunk_size=8192):
+            tmp_path = tmp_file.name
+            for chunk in response.iter_content(chunk_size=65536):
                 if chunk:
                     tmp_file.write(chunk)
-            tmp_path = tmp_file.name
-        text = []
-        with pdfplumber.open(tmp_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text.append(page_text)
-        os.remove(tmp_path)
-        return " ".join(text)
+        return _extract_pdf_text(tmp_path, parallel_pages)
     except Exception as e:
         print(f"Error extracting text from {url}: {str(e)}")
         return ""
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def extract_text_from_pdfs(urls: List[str], max_workers: int = 8) -> List[str]:
+    """
+    Extract text from several PDFs, overlapping their downloads in a thread pool.
+    Args:
+        urls (List[str]): URLs to the PDF files.
+        max_workers (int): Maximum number of concurrent downloads.
+    Returns:
+        List[str]: Extracted text per URL, in input order; empty string on failure.
+    """
+    if not urls:
+        return []
+    # Page-level process pools are disabled here to avoid one pool per concurrent download
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        return list(executor.map(lambda url: extract_text_from_pdf(url, parallel_pages=False), urls))
 
 def extract_text_from_local_pdf(file_path: str) -> str:
     """
@@ -72,13 +155,7 @@ def extract_text_from_local_pdf(file_path: str) -> str:
         str: Extracted text from the PDF, or empty string on failure.
     """
     try:
-        text = []
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text.append(page_text)
-        return " ".join(text)
+        return _extract_pdf_text(file_path)
     except Exception as e:
         print(f"Error extracting text from {file_path}: {str(e)}")
         return ""
@@ -93,8 +170,17 @@ def extract_text_from_html(url: str, selector: Optional[str] = None) -> str:
         str: Extracted text from the HTML page.
     """
     try:
-        response = requests.get(url, timeout=15)
+        response = _session.get(url, timeout=15)
         response.raise_for_status()
+        if SELECTOLAX_AVAILABLE:
+            try:
+                tree = HTMLParser(response.text)
+                if selector:
+                    return " ".join(node.text(separator=" ", strip=True) for node in tree.css(selector))
+                root = tree.body or tree.root
+                return root.text(separator=" ", strip=True) if root else ""
+            except Exception:
+                pass  # Pathological markup: retry with BeautifulSoup below
         soup = BeautifulSoup(response.text, "html.parser")
         if selector:
             elements = soup.select(selector)
@@ -114,6 +200,8 @@ def clean_text(text: str) -> str:
     Returns:
         str: Cleaned text.
     """
-    text = re.sub(r"\s+", " ", text)
-    text = re.sub(r"[^\x20-\x7E\n]", "", text)
+    text = _WHITESPACE_RE.sub(" ", text)
+    # Whitespace is already collapsed to spaces, so dropping non-ASCII and control
+    # characters leaves only printable ASCII (0x20-0x7E)
+    text = text.encode("ascii", "ignore").decode("ascii").translate(_ASCII_CONTROL_TABLE)
     return text.strip()
\ No newline at end of file
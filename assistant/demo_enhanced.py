@@ -64,10 +64,15 @@ async def demo_enhanced_system():
         "¿Cómo funciona la optimización de portafolios?"
     ]
     
+    # Run all queries concurrently; vector search and I/O overlap across threads
+    all_queries = english_queries + spanish_queries
+    responses = await asyncio.gather(*(asyncio.to_thread(agent.query, q) for q in all_queries))
+    english_responses = responses[:len(english_queries)]
+    spanish_responses = responses[len(english_queries):]
+    
     print("\n   🇺🇸 English Queries:")
-    for i, query in enumerate(english_queries, 1):
+    for i, (query, response) in enumerate(zip(english_queries, english_responses), 1):
         print(f"   {i}. Testing: '{query}'")
-        response = agent.query(query)
         lang = response['metadata'].get('language', 'unknown')
         print(f"      📊 Detected language: {lang}")
         print(f"      🎯 Topic: {response['metadata'].get('topic', 'general')}")
@@ -76,9 +81,8 @@ async def demo_enhanced_system():
         print()
     
     print("   🇪🇸 Spanish Queries:")
-    for i, query in enumerate(spanish_queries, 1):
+    for i, (query, response) in enumerate(zip(spanish_queries, spanish_responses), 1):
         print(f"   {i}. Testing: '{query}'")
-        response = agent.query(query)
         lang = response['metadata'].get('language', 'unknown')
         print(f"      📊 Detected language: {lang}")
         print(f"      🎯 Topic: {response['metadata'].get('topic', 'general')}")
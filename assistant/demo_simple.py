@@ -97,21 +97,13 @@ def main():
                 elif query.lower() == 'papers':
                     print("📚 Verificando papers recientes...")
                     try:
-                        import glob
-                        import json
-                        papers_dir = "./data/papers"
-                        if os.path.exists(papers_dir):
-                            recent_papers = glob.glob(os.path.join(papers_dir, "papers_*.json"))
-                            if recent_papers:
-                                latest_file = max(recent_papers, key=os.path.getctime)
-                                with open(latest_file, 'r') as f:
-                                    papers = json.load(f)
-                                print(f"📄 Papers disponibles: {len(papers)}")
-                                print("🔥 Últimos 3 papers:")
-                                for i, paper in enumerate(papers[:3]):
-                                    print(f"   {i+1}. {paper['title'][:60]}...")
-                            else:
-                                print("ℹ️ No hay papers descargados. Usa 'update' para descargar.")
+                        from realtime_papers import load_latest_papers
+                        latest_file, papers = load_latest_papers("./data/papers")
+                        if latest_file:
+                            print(f"📄 Papers disponibles: {len(papers)}")
+                            print("🔥 Últimos 3 papers:")
+                            for i, paper in enumerate(papers[:3]):
+                                print(f"   {i+1}. {paper['title'][:60]}...")
                         else:
                             print("ℹ️ No hay papers descargados. Usa 'update' para descargar.")
                     except Exception as e:
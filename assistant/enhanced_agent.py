@@ -13,369 +13,109 @@ Advanced AI agent with:
 - Real-time learning from ArXiv papers
 """
 
+import importlib.util
 import os
 import re
 import json
 import logging
+import threading
 import time
-from typing import Dict, List, Optional, Any, Tuple
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 
-# Language detection
+# Language detection; langdetect is imported on first use
+LANGDETECT_AVAILABLE = importlib.util.find_spec('langdetect') is not None
+if not LANGDETECT_AVAILABLE:
+    logging.info("langdetect not available - using keyword-based detection")
+
+# Fast JSON parsing for the papers snapshot
 try:
-    from langdetect import detect, DetectorFactory
-    from langdetect.lang_detect_exception import LangDetectException
-    DetectorFactory.seed = 0  # For consistent results
-    LANGDETECT_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    LANGDETECT_AVAILABLE = False
-    logging.info("langdetect not available - using keyword-based detection")
+    ORJSON_AVAILABLE = False
+
+# Multi-pattern keyword matching for topic identification
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Word tokenizer shared by paper indexing and query matching
+_WORD_RE = re.compile(r'\w+')
 
-class EnhancedMultilingualAgent:
-    """
-    Enhanced Multilingual Quantitative Finance AI Agent
-    
-    Features:
-    - Automatic language detection and response matching
-    - Dynamic paper integration and learning
-    - Enhanced knowledge base with real-time updates
-    - Improved response quality with recent research
-    """
-    
-    def __init__(self, vector_store):
-        """Initialize the enhanced multilingual agent."""
-        self.vector_store = vector_store
-        self.conversation_history = []
-        self.query_count = 0
-        self.learned_papers = []
-        
-        # Language detection patterns
-        self.spanish_patterns = [
-            r'\b(qué|que|cómo|como|cuál|cual|dónde|donde|cuándo|cuando|por qué|porque)\b',
-            r'\b(el|la|los|las|un|una|de|del|en|con|por|para|y|o|pero|si|no)\b',
-            r'\b(finanzas|riesgo|opciones|derivados|portafolio|modelo|precio|mercado)\b'
-        ]
-        
-        self.english_patterns = [
-            r'\b(what|how|which|where|when|why|who|can|could|would|should)\b',
-            r'\b(the|a|an|of|in|on|at|to|for|with|by|from|and|or|but|if|not)\b',
-            r'\b(finance|risk|options|derivatives|portfolio|model|price|market)\b'
-        ]
-        
-        # Initialize enhanced knowledge base
-        self._initialize_enhanced_knowledge()
-        
-        # Load and integrate recent papers
-        self._integrate_recent_papers()
-        
-        logger.info("🚀 Enhanced Multilingual Finance AI Agent initialized")
-    
-    def detect_language(self, text: str) -> str:
-        """
-        Detect the language of the input text.
-        
-        Args:
-            text: Input text to analyze
-            
-        Returns:
-            'es' for Spanish, 'en' for English
-        """
-        text_clean = text.lower().strip()
-        
-        # Try langdetect first if available
-        if LANGDETECT_AVAILABLE:
-            try:
-                detected = detect(text_clean)
-                if detected in ['es', 'en']:
-                    return detected
-            except LangDetectException:
-                pass
-        
-        # Fallback to pattern-based detection
-        spanish_score = sum(1 for pattern in self.spanish_patterns 
-                          if re.search(pattern, text_clean, re.IGNORECASE))
-        english_score = sum(1 for pattern in self.english_patterns 
-                          if re.search(pattern, text_clean, re.IGNORECASE))
-        
-        # Additional keyword scoring
-        spanish_keywords = ['finanzas', 'riesgo', 'opciones', 'modelo', 'precio', 'mercado', 'análisis']
-        english_keywords = ['finance', 'risk', 'options', 'model', 'price', 'market', 'analysis']
-        
-        spanish_score += sum(1 for word in spanish_keywords if word in text_clean)
-        english_score += sum(1 for word in english_keywords if word in text_clean)
-        
-        return 'es' if spanish_score > english_score else 'en'
-    
-    def _initialize_enhanced_knowledge(self):
-        """Initialize enhanced financial knowledge base."""
-        self.enhanced_concepts = {
-            'black_scholes': {
-                'keywords_en': ['black', 'scholes', 'option', 'pricing', 'call', 'put', 'european'],
-                'keywords_es': ['black', 'scholes', 'opción', 'opcion', 'precio', 'call', 'put', 'europea'],
-                'response_en': self._black_scholes_response_en,
-                'response_es': self._black_scholes_response_es
-            },
-            'var': {
-                'keywords_en': ['var', 'value at risk', 'risk', 'loss', 'confidence', 'percentile'],
-                'keywords_es': ['var', 'valor en riesgo', 'riesgo', 'pérdida', 'perdida', 'confianza'],
-                'response_en': self._var_response_en,
-                'response_es': self._var_response_es
-            },
-            'portfolio': {
-                'keywords_en': ['portfolio', 'markowitz', 'optimization', 'efficient', 'frontier', 'diversification'],
-                'keywords_es': ['portafolio', 'cartera', 'markowitz', 'optimización', 'eficiente', 'frontera', 'diversificación'],
-                'response_en': self._portfolio_response_en,
-                'response_es': self._portfolio_response_es
-            },
-            'derivatives': {
-                'keywords_en': ['derivative', 'futures', 'forwards', 'swaps', 'options', 'hedging'],
-                'keywords_es': ['derivado', 'futuro', 'forward', 'swap', 'opción', 'cobertura'],
-                'response_en': self._derivatives_response_en,
-                'response_es': self._derivatives_response_es
-            },
-            'monte_carlo': {
-                'keywords_en': ['monte carlo', 'simulation', 'random', 'sampling', 'numerical'],
-                'keywords_es': ['monte carlo', 'simulación', 'simulacion', 'aleatorio', 'muestreo', 'numérico'],
-                'response_en': self._monte_carlo_response_en,
-                'response_es': self._monte_carlo_response_es
-            }
-        }
-    
-    def _integrate_recent_papers(self):
-        """Integrate recent papers into the knowledge base."""
-        papers_dir = Path("./data/papers")
-        
-        if not papers_dir.exists():
-            logger.info("📚 No papers directory found - creating sample knowledge")
-            self._create_sample_knowledge()
-            return
-        
-        try:
-            # Find the most recent papers file
-            paper_files = list(papers_dir.glob("papers_*.json"))
-            if not paper_files:
-                logger.info("📄 No paper files found")
-                return
-            
-            latest_file = max(paper_files, key=lambda x: x.stat().st_mtime)
-            
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                papers = json.load(f)
-            
-            # Process and integrate papers
-            self.learned_papers = papers[:50]  # Keep recent 50 papers
-            
-            # Extract key concepts from papers
-            self._extract_paper_concepts(papers)
-            
-            logger.info(f"📚 Integrated {len(papers)} recent papers into knowledge base")
-            
-            # Store paper integration info
-            self.papers_info = {
-                'count': len(papers),
-                'last_update': datetime.now().isoformat(),
-                'file': str(latest_file),
-                'topics': self._extract_paper_topics(papers[:10])
-            }
-            
-        except Exception as e:
-            logger.error(f"Error integrating papers: {e}")
-            self._create_sample_knowledge()
-    
-    def _extract_paper_concepts(self, papers: List[Dict]):
-        """Extract and learn concepts from recent papers."""
-        concept_keywords = {}
-        
-        for paper in papers:
-            title = paper.get('title', '').lower()
-            summary = paper.get('summary', '').lower()
-            
-            # Extract financial keywords
-            financial_terms = [
-                'volatility', 'option', 'derivative', 'portfolio', 'risk',
-                'black-scholes', 'monte carlo', 'var', 'capm', 'sharpe',
-                'volatilidad', 'opción', 'derivado', 'cartera', 'riesgo'
-            ]
-            
-            for term in financial_terms:
-                if term in title or term in summary:
-                    if term not in concept_keywords:
-                        concept_keywords[term] = []
-                    concept_keywords[term].append({
-                        'title': paper.get('title', '')[:100],
-                        'authors': paper.get('authors', [])[:3],
-                        'summary': summary[:200]
-                    })
-        
-        self.dynamic_concepts = concept_keywords
-        logger.info(f"🧠 Extracted {len(concept_keywords)} dynamic concepts from papers")
-    
-    def _extract_paper_topics(self, papers: List[Dict]) -> List[str]:
-        """Extract main topics from recent papers."""
-        topics = []
-        for paper in papers:
-            title = paper.get('title', '')
-            # Extract key topics using simple keyword matching
-            if any(term in title.lower() for term in ['option', 'pricing', 'black-scholes']):
-                topics.append('Options Pricing')
-            elif any(term in title.lower() for term in ['risk', 'var', 'value at risk']):
-                topics.append('Risk Management')
-            elif any(term in title.lower() for term in ['portfolio', 'optimization']):
-                topics.append('Portfolio Theory')
-            elif any(term in title.lower() for term in ['monte carlo', 'simulation']):
-                topics.append('Computational Finance')
-        
-        return list(set(topics))[:5]  # Return unique topics, max 5
-    
-    def _create_sample_knowledge(self):
-        """Create sample knowledge when no papers are available."""
-        self.papers_info = {
-            'count': 0,
-            'last_update': datetime.now().isoformat(),
-            'file': 'none',
-            'topics': ['Sample Topics']
-        }
-    
-    def query(self, question: str) -> Dict[str, Any]:
-        """
-        Process a financial query with automatic language detection and response matching.
-        
-        Args:
-            question: The financial question in Spanish or English
-            
-        Returns:
-            Dictionary with response in the same language as the query
-        """
-        start_time = datetime.now()
-        self.query_count += 1
-        
-        try:
-            # Detect query language
-            detected_lang = self.detect_language(question)
-            logger.info(f"🗣️ Detected language: {detected_lang}")
-            
-            # Get relevant documents from vector store
-            docs = self.vector_store.similarity_search(question, k=5)
-            
-            # Identify topic
-            main_topic = self._identify_topic(question, detected_lang)
-            
-            # Generate response in the detected language
-            if main_topic and main_topic in self.enhanced_concepts:
-                response_func = self.enhanced_concepts[main_topic][f'response_{detected_lang}']
-                response = response_func(question, docs)
-            else:
-                response = self._general_response(question, docs, detected_lang)
-            
-            # Add recent papers context if relevant
-            response = self._enhance_with_papers(response, question, detected_lang)
-            
-            # Calculate response time
-            response_time = (datetime.now() - start_time).total_seconds()
-            
-            # Store in conversation history
-            self.conversation_history.append({
-                'question': question,
-                'response': response,
-                'language': detected_lang,
-                'timestamp': start_time,
-                'response_time': response_time
-            })
-            
-            return {
-                'result': response,
-                'source_documents': docs,
-                'metadata': {
-                    'language': detected_lang,
-                    'topic': main_topic,
-                    'response_time': response_time,
-                    'source_count': len(docs),
-                    'query_number': self.query_count,
-                    'papers_integrated': len(self.learned_papers)
-                }
-            }
-            
-        except Exception as e:
-            logger.error(f"Error processing query: {e}")
-            error_msg = self._get_error_message(detected_lang if 'detected_lang' in locals() else 'en')
-            return {
-                'result': error_msg,
-                'source_documents': [],
-                'metadata': {'error': True, 'error_message': str(e)}
-            }
-    
-    def _identify_topic(self, question: str, language: str) -> Optional[str]:
-        """Identify the main financial topic considering language."""
-        question_lower = question.lower()
-        
-        for topic, data in self.enhanced_concepts.items():
-            keywords = data[f'keywords_{language}']
-            if any(keyword in question_lower for keyword in keywords):
-                return topic
-        
+
+def _singular(word: str) -> str:
+    """Strip a regular English plural so 'options' matches 'option' and 'volatilities' 'volatility'."""
+    if word.endswith('ies') and len(word) > 4:
+        return word[:-3] + 'y'
+    if word.endswith('sses'):
+        return word[:-2]
+    if word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+
+# Financial keywords learned from paper titles and summaries
+_FINANCIAL_TERMS = (
+    'volatility', 'option', 'derivative', 'portfolio', 'risk',
+    'black-scholes', 'monte carlo', 'var', 'capm', 'sharpe',
+    'volatilidad', 'opción', 'derivado', 'cartera', 'riesgo'
+)
+
+
+# Title words (split by _WORD_RE, so hyphenated compounds yield their parts) that mark
+# a paper's main topic; the first matching topic wins
+_TOPIC_TRIGGERS = {
+    'Options Pricing': frozenset({'option', 'options', 'pricing', 'scholes'}),
+    'Risk Management': frozenset({'risk', 'risks', 'var'}),
+    'Portfolio Theory': frozenset({'portfolio', 'portfolios', 'optimization'}),
+    'Computational Finance': frozenset({'monte', 'simulation', 'simulations'})
+}
+
+
+@lru_cache(maxsize=1)
+def _load_langdetect():
+    """Import langdetect on first use; returns (detect, LangDetectException) or None."""
+    if not LANGDETECT_AVAILABLE:
         return None
-    
-    def _enhance_with_papers(self, response: str, question: str, language: str) -> str:
-        """Enhance response with relevant recent papers."""
-        if not self.learned_papers:
-            return response
-        
-        # Find relevant papers
-        relevant_papers = []
-        question_lower = question.lower()
-        
-        for paper in self.learned_papers[:10]:  # Check recent 10 papers
-            title = paper.get('title', '').lower()
-            summary = paper.get('summary', '').lower()
-            
-            # Simple relevance check
-            if any(word in title or word in summary for word in question_lower.split() if len(word) > 3):
-                relevant_papers.append(paper)
-        
-        if relevant_papers:
-            if language == 'es':
-                papers_section = f"\n\n## 📚 Investigación Reciente Relacionada:\n\n"
-                papers_section += f"*Basado en {len(self.learned_papers)} papers recientes de ArXiv*\n\n"
-                for i, paper in enumerate(relevant_papers[:3], 1):
-                    title = paper.get('title', 'Sin título')[:100]
-                    authors = ', '.join(paper.get('authors', [])[:2])
-                    papers_section += f"**{i}.** {title}\n"
-                    papers_section += f"   *Autores: {authors}*\n\n"
-            else:
-                papers_section = f"\n\n## 📚 Related Recent Research:\n\n"
-                papers_section += f"*Based on {len(self.learned_papers)} recent ArXiv papers*\n\n"
-                for i, paper in enumerate(relevant_papers[:3], 1):
-                    title = paper.get('title', 'Untitled')[:100]
-                    authors = ', '.join(paper.get('authors', [])[:2])
-                    papers_section += f"**{i}.** {title}\n"
-                    papers_section += f"   *Authors: {authors}*\n\n"
-            
-            response += papers_section
-        
-        return response
-    
-    def _get_error_message(self, language: str) -> str:
-        """Get error message in appropriate language."""
-        if language == 'es':
-            return "Disculpa, encontré un error procesando tu pregunta. Por favor intenta reformularla."
-        else:
-            return "I apologize, but I encountered an error processing your question. Please try rephrasing it."
-    
-    def _general_response(self, question: str, docs: List, language: str) -> str:
-        """Generate a general response in the appropriate language."""
-        if language == 'es':
-            return f"""
+    try:
+        from langdetect import detect, DetectorFactory
+        from langdetect.lang_detect_exception import LangDetectException
+    except ImportError:
+        return None
+    DetectorFactory.seed = 0  # For consistent results
+    return detect, LangDetectException
+
+
+@lru_cache(maxsize=1)
+def _financial_terms_automaton():
+    """Build the Aho-Corasick automaton mapping each financial term to its index, once."""
+    automaton = ahocorasick.Automaton()
+    for rank, term in enumerate(_FINANCIAL_TERMS):
+        automaton.add_word(term, rank)
+    automaton.make_automaton()
+    return automaton
+
+
+# General-response bodies, filled in with str.format_map
+_GENERAL_TEMPLATES = {
+    'es': """
 ## 💼 Respuesta del Asistente de Finanzas Cuantitativas SPINOR
 
 **Pregunta:** {question}
 
-Basándome en mi base de conocimientos de finanzas cuantitativas y {len(self.learned_papers)} papers recientes, aquí está mi análisis:
+Basándome en mi base de conocimientos de finanzas cuantitativas y {n_papers} papers recientes, aquí está mi análisis:
 
 ### 🔍 Análisis:
 
@@ -398,15 +138,14 @@ Esta es una consulta interesante sobre finanzas cuantitativas. Basado en los doc
 
 Consulta papers recientes en ArXiv categorías q-fin.* para investigación actualizada.
 
-*Respuesta generada por SPINOR AI con {len(docs)} documentos de referencia*
-            """
-        else:
-            return f"""
+*Respuesta generada por SPINOR AI con {n_docs} documentos de referencia*
+            """,
+    'en': """
 ## 💼 SPINOR Quantitative Finance Assistant Response
 
 **Query:** {question}
 
-Based on my quantitative finance knowledge base and {len(self.learned_papers)} recent papers, here's my analysis:
+Based on my quantitative finance knowledge base and {n_papers} recent papers, here's my analysis:
 
 ### 🔍 Analysis:
 
@@ -429,13 +168,14 @@ This is an interesting quantitative finance query. Based on the documents availa
 
 Check recent papers in ArXiv q-fin.* categories for updated research.
 
-*Response generated by SPINOR AI with {len(docs)} reference documents*
+*Response generated by SPINOR AI with {n_docs} reference documents*
             """
-    
-    # Enhanced concept responses in both languages
-    def _black_scholes_response_es(self, question: str, docs: List) -> str:
-        """Respuesta sobre Black-Scholes en español."""
-        return """
+}
+
+# Static concept bodies, built once at import instead of on every response
+_CONCEPT_RESPONSES = {
+    'black_scholes': {
+        'es': """
 ## 📈 Modelo Black-Scholes - Análisis Detallado
 
 ### 🎯 Fórmula Principal:
@@ -478,11 +218,8 @@ Donde:
 2. **Gestión de riesgos** con las griegas
 3. **Estrategias de cobertura**
 4. **Arbitraje** de volatilidad
-        """
-    
-    def _black_scholes_response_en(self, question: str, docs: List) -> str:
-        """Black-Scholes response in English."""
-        return """
+        """,
+        'en': """
 ## 📈 Black-Scholes Model - Detailed Analysis
 
 ### 🎯 Main Formula:
@@ -525,11 +262,10 @@ Where:
 2. **Risk management** with Greeks
 3. **Hedging strategies**
 4. **Volatility** arbitrage
-        """
-    
-    def _var_response_es(self, question: str, docs: List) -> str:
-        """Respuesta sobre VaR en español."""
-        return """
+        """,
+    },
+    'var': {
+        'es': """
 ## ⚠️ Value at Risk (VaR) - Gestión de Riesgos
 
 ### 🎯 Definición:
@@ -572,11 +308,8 @@ El **VaR** es una medida estadística que cuantifica el nivel de riesgo financie
 ### 🔄 Expected Shortfall (ES):
 **Complemento del VaR** que mide la pérdida esperada cuando se excede el VaR.
 ES = E[Pérdida | Pérdida > VaR]
-        """
-    
-    def _var_response_en(self, question: str, docs: List) -> str:
-        """VaR response in English."""
-        return """
+        """,
+        'en': """
 ## ⚠️ Value at Risk (VaR) - Risk Management
 
 ### 🎯 Definition:
@@ -619,11 +352,10 @@ ES = E[Pérdida | Pérdida > VaR]
 ### 🔄 Expected Shortfall (ES):
 **VaR complement** that measures expected loss when VaR is exceeded.
 ES = E[Loss | Loss > VaR]
-        """
-    
-    def _portfolio_response_es(self, question: str, docs: List) -> str:
-        """Respuesta sobre teoría de portafolios en español."""
-        return """
+        """,
+    },
+    'portfolio': {
+        'es': """
 ## 📊 Teoría Moderna de Portafolios (Markowitz)
 
 ### 🎯 Concepto Central:
@@ -684,11 +416,8 @@ Mide el **retorno excesivo por unidad de riesgo**.
 - **Black-Litterman**: Incorpora views del gestor
 - **Risk Parity**: Iguala contribuciones de riesgo
 - **Factor Models**: Usa factores de riesgo comunes
-        """
-    
-    def _portfolio_response_en(self, question: str, docs: List) -> str:
-        """Portfolio theory response in English."""
-        return """
+        """,
+        'en': """
 ## 📊 Modern Portfolio Theory (Markowitz)
 
 ### 🎯 Central Concept:
@@ -749,11 +478,10 @@ Measures **excess return per unit of risk**.
 - **Black-Litterman**: Incorporates manager views
 - **Risk Parity**: Equalizes risk contributions
 - **Factor Models**: Uses common risk factors
-        """
-    
-    def _derivatives_response_es(self, question: str, docs: List) -> str:
-        """Respuesta sobre derivados en español."""
-        return """
+        """,
+    },
+    'derivatives': {
+        'es': """
 ## 🔄 Instrumentos Derivados - Análisis Completo
 
 ### 🎯 Definición:
@@ -819,11 +547,8 @@ Measures **excess return per unit of risk**.
 - **EMIR** (Europa)
 - **Cámaras de compensación** (CCPs)
 - **Márgenes obligatorios**
-        """
-    
-    def _derivatives_response_en(self, question: str, docs: List) -> str:
-        """Derivatives response in English."""
-        return """
+        """,
+        'en': """
 ## 🔄 Derivative Instruments - Complete Analysis
 
 ### 🎯 Definition:
@@ -889,11 +614,10 @@ Measures **excess return per unit of risk**.
 - **EMIR** (Europe)
 - **Central Clearing Counterparties** (CCPs)
 - **Mandatory margins**
-        """
-    
-    def _monte_carlo_response_es(self, question: str, docs: List) -> str:
-        """Respuesta sobre Monte Carlo en español."""
-        return """
+        """,
+    },
+    'monte_carlo': {
+        'es': """
 ## 🎲 Simulación Monte Carlo en Finanzas
 
 ### 🎯 Concepto:
@@ -969,11 +693,8 @@ Donde Z ~ N(0,1)
 - **Semillas fijas** para reproducibilidad
 - **Paralelización** en GPU/cluster
 - **Análisis de convergencia**
-        """
-    
-    def _monte_carlo_response_en(self, question: str, docs: List) -> str:
-        """Monte Carlo response in English."""
-        return """
+        """,
+        'en': """
 ## 🎲 Monte Carlo Simulation in Finance
 
 ### 🎯 Concept:
@@ -1049,7 +770,510 @@ Where Z ~ N(0,1)
 - **Fixed seeds** for reproducibility
 - **GPU/cluster parallelization**
 - **Convergence analysis**
+        """,
+    },
+}
+
+
+@dataclass(frozen=True)
+class FinanceConcept:
+    """Keywords and response builders for one financial topic in both languages."""
+    keywords_en: Tuple[str, ...]
+    keywords_es: Tuple[str, ...]
+    response_en: Callable[[str, List], str]
+    response_es: Callable[[str, List], str]
+    
+    def keywords(self, language: str) -> Tuple[str, ...]:
+        """Return the topic keywords for 'es' or 'en'."""
+        return self.keywords_es if language == 'es' else self.keywords_en
+    
+    def response(self, language: str) -> Callable[[str, List], str]:
+        """Return the response builder for 'es' or 'en'."""
+        return self.response_es if language == 'es' else self.response_en
+
+
+class EnhancedMultilingualAgent:
+    """
+    Enhanced Multilingual Quantitative Finance AI Agent
+    
+    Features:
+    - Automatic language detection and response matching
+    - Dynamic paper integration and learning
+    - Enhanced knowledge base with real-time updates
+    - Improved response quality with recent research
+    """
+    
+    # Language detection patterns
+    spanish_patterns = [
+        r'\b(qué|que|cómo|como|cuál|cual|dónde|donde|cuándo|cuando|por qué|porque)\b',
+        r'\b(el|la|los|las|un|una|de|del|en|con|por|para|y|o|pero|si|no)\b',
+        r'\b(finanzas|riesgo|opciones|derivados|portafolio|modelo|precio|mercado)\b'
+    ]
+    
+    english_patterns = [
+        r'\b(what|how|which|where|when|why|who|can|could|would|should)\b',
+        r'\b(the|a|an|of|in|on|at|to|for|with|by|from|and|or|but|if|not)\b',
+        r'\b(finance|risk|options|derivatives|portfolio|model|price|market)\b'
+    ]
+    
+    # Additional keywords scored by substring presence
+    spanish_keywords = ['finanzas', 'riesgo', 'opciones', 'modelo', 'precio', 'mercado', 'análisis']
+    english_keywords = ['finance', 'risk', 'options', 'model', 'price', 'market', 'analysis']
+    
+    # Compiled once when the class is defined and shared by every instance
+    _spanish_re = tuple(re.compile(pattern, re.IGNORECASE) for pattern in spanish_patterns)
+    _english_re = tuple(re.compile(pattern, re.IGNORECASE) for pattern in english_patterns)
+    _spanish_keywords_re = re.compile('|'.join(map(re.escape, spanish_keywords)))
+    _english_keywords_re = re.compile('|'.join(map(re.escape, english_keywords)))
+    # Characters that only occur in Spanish among the supported languages; accented vowels
+    # are left to langdetect and the patterns, since English text has them in names like Lévy
+    _spanish_glyphs_re = re.compile('[ñ¿¡]')
+    # Below this length langdetect is unreliable and the pattern scores decide
+    short_text_length = 15
+    
+    def __init__(self, vector_store, max_history: int = 1000):
+        """Initialize the enhanced multilingual agent."""
+        self.vector_store = vector_store
+        # Oldest interactions are dropped once the session exceeds max_history
+        self.conversation_history = deque(maxlen=max_history)
+        self.query_count = 0
+        self._query_count_lock = threading.Lock()  # query may run in several threads
+        self.learned_papers = []
+        # Column layout of the papers checked by _enhance_with_papers, in the same order
+        self._paper_token_sets = []
+        self._paper_titles = []
+        self._paper_author_lines = []
+        
+        # Initialize enhanced knowledge base
+        self._initialize_enhanced_knowledge()
+        
+        # Load and integrate recent papers
+        self._integrate_recent_papers()
+        
+        logger.info("🚀 Enhanced Multilingual Finance AI Agent initialized")
+    
+    def detect_language(self, text: str) -> str:
         """
+        Detect the language of the input text.
+        
+        Args:
+            text: Input text to analyze
+            
+        Returns:
+            'es' for Spanish, 'en' for English
+        """
+        return self._detect_language_cached(text.lower().strip())
+    
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _detect_language_cached(cls, text_clean: str) -> str:
+        """Detect the language of normalized text; repeated questions are served from cache."""
+        # Cheap decisive cases skip the langdetect n-gram classifier
+        if cls._spanish_glyphs_re.search(text_clean):
+            return 'es'
+        if len(text_clean) < cls.short_text_length:
+            return cls._pattern_language(text_clean)
+        
+        # Try langdetect first if available
+        langdetect = _load_langdetect()
+        if langdetect is not None:
+            detect, LangDetectException = langdetect
+            try:
+                detected = detect(text_clean)
+                if detected in ['es', 'en']:
+                    return detected
+            except LangDetectException:
+                pass
+        
+        return cls._pattern_language(text_clean)
+    
+    @classmethod
+    def _pattern_language(cls, text_clean: str) -> str:
+        """Score normalized text against the Spanish and English patterns and keywords."""
+        # Positive scores favour Spanish; ties go to English
+        score = (sum(1 for pattern in cls._spanish_re if pattern.search(text_clean))
+                 - sum(1 for pattern in cls._english_re if pattern.search(text_clean)))
+        
+        # Additional keyword scoring: one scan per language, each keyword counted once.
+        # Scan the leading language first and skip the other scan once it cannot
+        # overturn the result.
+        if score > 0:
+            score += len(set(cls._spanish_keywords_re.findall(text_clean)))
+            if score > len(cls.english_keywords):
+                return 'es'
+            score -= len(set(cls._english_keywords_re.findall(text_clean)))
+        else:
+            score -= len(set(cls._english_keywords_re.findall(text_clean)))
+            if score + len(cls.spanish_keywords) <= 0:
+                return 'en'
+            score += len(set(cls._spanish_keywords_re.findall(text_clean)))
+        
+        return 'es' if score > 0 else 'en'
+    
+    def _initialize_enhanced_knowledge(self):
+        """Initialize enhanced financial knowledge base."""
+        self.enhanced_concepts = {
+            'black_scholes': FinanceConcept(
+                keywords_en=('black', 'scholes', 'option', 'pricing', 'call', 'put', 'european'),
+                keywords_es=('black', 'scholes', 'opción', 'opcion', 'precio', 'call', 'put', 'europea'),
+                response_en=self._black_scholes_response_en,
+                response_es=self._black_scholes_response_es
+            ),
+            'var': FinanceConcept(
+                keywords_en=('var', 'value at risk', 'risk', 'loss', 'confidence', 'percentile'),
+                keywords_es=('var', 'valor en riesgo', 'riesgo', 'pérdida', 'perdida', 'confianza'),
+                response_en=self._var_response_en,
+                response_es=self._var_response_es
+            ),
+            'portfolio': FinanceConcept(
+                keywords_en=('portfolio', 'markowitz', 'optimization', 'efficient', 'frontier', 'diversification'),
+                keywords_es=('portafolio', 'cartera', 'markowitz', 'optimización', 'eficiente', 'frontera', 'diversificación'),
+                response_en=self._portfolio_response_en,
+                response_es=self._portfolio_response_es
+            ),
+            'derivatives': FinanceConcept(
+                keywords_en=('derivative', 'futures', 'forwards', 'swaps', 'options', 'hedging'),
+                keywords_es=('derivado', 'futuro', 'forward', 'swap', 'opción', 'cobertura'),
+                response_en=self._derivatives_response_en,
+                response_es=self._derivatives_response_es
+            ),
+            'monte_carlo': FinanceConcept(
+                keywords_en=('monte carlo', 'simulation', 'random', 'sampling', 'numerical'),
+                keywords_es=('monte carlo', 'simulación', 'simulacion', 'aleatorio', 'muestreo', 'numérico'),
+                response_en=self._monte_carlo_response_en,
+                response_es=self._monte_carlo_response_es
+            )
+        }
+        self._topic_names = tuple(self.enhanced_concepts)
+        # (topic, language) -> responder, so query dispatches with a single lookup
+        self._responders = {
+            (topic, language): concept.response(language)
+            for topic, concept in self.enhanced_concepts.items()
+            for language in ('es', 'en')
+        }
+        self._topic_automata = self._build_topic_automata()
+        # Per-instance so the cache never outlives this agent's concept table
+        self._identify_topic_cached = lru_cache(maxsize=512)(self._match_topic)
+    
+    def _build_topic_automata(self) -> Dict[str, Any]:
+        """Build one Aho-Corasick automaton per language mapping keywords to topic rank."""
+        if not AHOCORASICK_AVAILABLE:
+            return {}
+        automata = {}
+        for language in ('es', 'en'):
+            automaton = ahocorasick.Automaton()
+            for rank, data in enumerate(self.enhanced_concepts.values()):
+                for keyword in data.keywords(language):
+                    # A keyword shared by several topics keeps the earliest topic
+                    if keyword not in automaton:
+                        automaton.add_word(keyword, rank)
+            automaton.make_automaton()
+            automata[language] = automaton
+        return automata
+    
+    def _integrate_recent_papers(self):
+        """Integrate recent papers into the knowledge base."""
+        papers_dir = Path("./data/papers")
+        
+        if not papers_dir.exists():
+            logger.info("📚 No papers directory found - creating sample knowledge")
+            self._create_sample_knowledge()
+            return
+        
+        try:
+            # Find the most recent papers file
+            paper_files = list(papers_dir.glob("papers_*.json"))
+            if not paper_files:
+                logger.info("📄 No paper files found")
+                return
+            
+            latest_file = max(paper_files, key=lambda x: x.stat().st_mtime)
+            
+            if ORJSON_AVAILABLE:
+                papers = orjson.loads(latest_file.read_bytes())
+            else:
+                with open(latest_file, 'r', encoding='utf-8') as f:
+                    papers = json.load(f)
+            
+            # Lowercase once; concept extraction, topic extraction and indexing reuse these
+            for paper in papers:
+                paper['_title_lc'] = paper.get('title', '').lower()
+                paper['_summary_lc'] = paper.get('summary', '').lower()
+            
+            # Process and integrate papers
+            self.learned_papers = papers[:50]  # Keep recent 50 papers
+            self._index_learned_papers()
+            
+            # Extract key concepts from papers
+            self._extract_paper_concepts(papers)
+            
+            logger.info(f"📚 Integrated {len(papers)} recent papers into knowledge base")
+            
+            # Store paper integration info
+            self.papers_info = {
+                'count': len(papers),
+                'last_update': datetime.now().isoformat(),
+                'file': str(latest_file),
+                'topics': self._extract_paper_topics(papers[:10])
+            }
+            
+        except Exception as e:
+            logger.error(f"Error integrating papers: {e}")
+            self._create_sample_knowledge()
+    
+    def _index_learned_papers(self):
+        """Precompute word sets and display fields for paper relevance checks."""
+        # Only the first papers are considered when enhancing responses
+        papers = self.learned_papers[:10]
+        self._paper_token_sets = [
+            frozenset(_singular(word)
+                      for word in _WORD_RE.findall(f"{paper['_title_lc']} {paper['_summary_lc']}")
+                      if len(word) > 3)
+            for paper in papers
+        ]
+        # None marks a missing title so the response can use a localized placeholder
+        self._paper_titles = [paper.get('title') for paper in papers]
+        self._paper_author_lines = [', '.join(paper.get('authors', [])[:2]) for paper in papers]
+    
+    def _extract_paper_concepts(self, papers: List[Dict]):
+        """Extract and learn concepts from recent papers."""
+        concept_keywords = {}
+        
+        automaton = _financial_terms_automaton() if AHOCORASICK_AVAILABLE else None
+        
+        for paper in papers:
+            title = paper['_title_lc']
+            summary = paper['_summary_lc']
+            
+            if automaton is not None:
+                # One pass over title and summary; the newline keeps terms from spanning both
+                ranks = sorted({rank for _, rank in automaton.iter(f"{title}\n{summary}")})
+                matched_terms = [_FINANCIAL_TERMS[rank] for rank in ranks]
+            else:
+                matched_terms = [term for term in _FINANCIAL_TERMS if term in title or term in summary]
+            
+            for term in matched_terms:
+                if term not in concept_keywords:
+                    concept_keywords[term] = []
+                concept_keywords[term].append({
+                    'title': paper.get('title', '')[:100],
+                    'authors': paper.get('authors', [])[:3],
+                    'summary': summary[:200]
+                })
+        
+        self.dynamic_concepts = concept_keywords
+        logger.info(f"🧠 Extracted {len(concept_keywords)} dynamic concepts from papers")
+    
+    def _extract_paper_topics(self, papers: List[Dict]) -> List[str]:
+        """Extract main topics from recent papers."""
+        topics = set()
+        for paper in papers:
+            # Extract key topics by matching title words against each topic's triggers
+            title_words = frozenset(_WORD_RE.findall(paper['_title_lc']))
+            for topic, triggers in _TOPIC_TRIGGERS.items():
+                if title_words & triggers:
+                    topics.add(topic)
+                    break
+            if len(topics) == len(_TOPIC_TRIGGERS):
+                break  # Every topic already found; the rest cannot add any
+        
+        return list(topics)[:5]  # Return unique topics, max 5
+    
+    def _create_sample_knowledge(self):
+        """Create sample knowledge when no papers are available."""
+        self.papers_info = {
+            'count': 0,
+            'last_update': datetime.now().isoformat(),
+            'file': 'none',
+            'topics': ['Sample Topics']
+        }
+    
+    def query(self, question: str) -> Dict[str, Any]:
+        """
+        Process a financial query with automatic language detection and response matching.
+        
+        Args:
+            question: The financial question in Spanish or English
+            
+        Returns:
+            Dictionary with response in the same language as the query
+        """
+        start_time = datetime.now()
+        start_perf = time.perf_counter()
+        with self._query_count_lock:
+            self.query_count += 1
+            query_number = self.query_count
+        
+        try:
+            # Detect query language
+            # Lowercase once; detection, topic matching and paper matching share it
+            question_lower = question.lower()
+            detected_lang = self._detect_language_cached(question_lower.strip())
+            logger.info(f"🗣️ Detected language: {detected_lang}")
+            
+            # Get relevant documents from vector store
+            docs = self.vector_store.similarity_search(question, k=5)
+            
+            # Identify topic
+            main_topic = self._identify_topic(question_lower, detected_lang)
+            
+            # Generate response in the detected language
+            responder = self._responders.get((main_topic, detected_lang))
+            if responder is not None:
+                response = responder(question, docs)
+            else:
+                response = self._general_response(question, docs, detected_lang)
+            
+            # Add recent papers context if relevant
+            response = self._enhance_with_papers(response, question_lower, detected_lang)
+            
+            # Calculate response time
+            response_time = time.perf_counter() - start_perf
+            
+            # Store in conversation history
+            self.conversation_history.append({
+                'question': question,
+                'response': response,
+                'language': detected_lang,
+                'timestamp': start_time,
+                'response_time': response_time
+            })
+            
+            return {
+                'result': response,
+                'source_documents': docs,
+                'metadata': {
+                    'language': detected_lang,
+                    'topic': main_topic,
+                    'response_time': response_time,
+                    'source_count': len(docs),
+                    'query_number': query_number,
+                    'papers_integrated': len(self.learned_papers)
+                }
+            }
+            
+        except Exception as e:
+            logger.error(f"Error processing query: {e}")
+            error_msg = self._get_error_message(detected_lang if 'detected_lang' in locals() else 'en')
+            return {
+                'result': error_msg,
+                'source_documents': [],
+                'metadata': {'error': True, 'error_message': str(e)}
+            }
+    
+    def _identify_topic(self, question_lower: str, language: str) -> Optional[str]:
+        """Identify the main financial topic of a lowercased question considering language."""
+        return self._identify_topic_cached(question_lower, language)
+    
+    def _match_topic(self, question_lower: str, language: str) -> Optional[str]:
+        """Match a lowercased question against the topic keywords of a language."""
+        automaton = self._topic_automata.get(language)
+        if automaton is not None:
+            # Single pass over the question; the earliest-declared matching topic wins
+            best_rank = min((rank for _, rank in automaton.iter(question_lower)), default=None)
+            return None if best_rank is None else self._topic_names[best_rank]
+        
+        for topic, data in self.enhanced_concepts.items():
+            keywords = data.keywords(language)
+            if any(keyword in question_lower for keyword in keywords):
+                return topic
+        
+        return None
+    
+    def _enhance_with_papers(self, response: str, question_lower: str, language: str) -> str:
+        """Enhance response with papers relevant to a lowercased question."""
+        if not self.learned_papers:
+            return response
+        
+        # Find relevant papers: any shared word longer than 3 characters, plurals folded to
+        # the singular on both sides. The question's words are filtered once here, and
+        # scanning stops at the three papers shown.
+        question_words = frozenset(_singular(word) for word in _WORD_RE.findall(question_lower)
+                                   if len(word) > 3)
+        if not question_words:
+            return response
+        relevant = list(islice((i for i, words in enumerate(self._paper_token_sets)
+                                if not question_words.isdisjoint(words)), 3))
+        
+        if not relevant:
+            return response
+        
+        if language == 'es':
+            parts = [response, "\n\n## 📚 Investigación Reciente Relacionada:\n\n",
+                     f"*Basado en {len(self.learned_papers)} papers recientes de ArXiv*\n\n"]
+            untitled, authors_label = 'Sin título', 'Autores'
+        else:
+            parts = [response, "\n\n## 📚 Related Recent Research:\n\n",
+                     f"*Based on {len(self.learned_papers)} recent ArXiv papers*\n\n"]
+            untitled, authors_label = 'Untitled', 'Authors'
+        for n, i in enumerate(relevant, 1):
+            title = self._paper_titles[i]
+            title = (untitled if title is None else title)[:100]
+            parts.append(f"**{n}.** {title}\n   *{authors_label}: {self._paper_author_lines[i]}*\n\n")
+        
+        return ''.join(parts)
+    
+    def reset_caches(self):
+        """Clear cached language detection and topic lookups."""
+        self._detect_language_cached.cache_clear()
+        self._identify_topic_cached.cache_clear()
+    
+    def _get_error_message(self, language: str) -> str:
+        """Get error message in appropriate language."""
+        if language == 'es':
+            return "Disculpa, encontré un error procesando tu pregunta. Por favor intenta reformularla."
+        else:
+            return "I apologize, but I encountered an error processing your question. Please try rephrasing it."
+    
+    def _general_response(self, question: str, docs: List, language: str) -> str:
+        """Generate a general response in the appropriate language."""
+        template = _GENERAL_TEMPLATES['es' if language == 'es' else 'en']
+        return template.format_map({
+            'question': question,
+            'n_papers': len(self.learned_papers),
+            'n_docs': len(docs)
+        })
+    
+    # Enhanced concept responses in both languages
+    def _black_scholes_response_es(self, question: str, docs: List) -> str:
+        """Respuesta sobre Black-Scholes en español."""
+        return _CONCEPT_RESPONSES['black_scholes']['es']
+    
+    def _black_scholes_response_en(self, question: str, docs: List) -> str:
+        """Black-Scholes response in English."""
+        return _CONCEPT_RESPONSES['black_scholes']['en']
+    
+    def _var_response_es(self, question: str, docs: List) -> str:
+        """Respuesta sobre VaR en español."""
+        return _CONCEPT_RESPONSES['var']['es']
+    
+    def _var_response_en(self, question: str, docs: List) -> str:
+        """VaR response in English."""
+        return _CONCEPT_RESPONSES['var']['en']
+    
+    def _portfolio_response_es(self, question: str, docs: List) -> str:
+        """Respuesta sobre teoría de portafolios en español."""
+        return _CONCEPT_RESPONSES['portfolio']['es']
+    
+    def _portfolio_response_en(self, question: str, docs: List) -> str:
+        """Portfolio theory response in English."""
+        return _CONCEPT_RESPONSES['portfolio']['en']
+    
+    def _derivatives_response_es(self, question: str, docs: List) -> str:
+        """Respuesta sobre derivados en español."""
+        return _CONCEPT_RESPONSES['derivatives']['es']
+    
+    def _derivatives_response_en(self, question: str, docs: List) -> str:
+        """Derivatives response in English."""
+        return _CONCEPT_RESPONSES['derivatives']['en']
+    
+    def _monte_carlo_response_es(self, question: str, docs: List) -> str:
+        """Respuesta sobre Monte Carlo en español."""
+        return _CONCEPT_RESPONSES['monte_carlo']['es']
+    
+    def _monte_carlo_response_en(self, question: str, docs: List) -> str:
+        """Monte Carlo response in English."""
+        return _CONCEPT_RESPONSES['monte_carlo']['en']
     
     def health_check(self) -> Dict[str, Any]:
         """Perform system health check with language-aware status."""
@@ -11,34 +11,163 @@ into the AI knowledge base with improved learning capabilities.
 
 import os
 import sys
+import copy
 import json
 import logging
 import time
 import asyncio
+import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, is_dataclass
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import islice, repeat, takewhile
 
-# ArXiv integration
+# ArXiv integration; arxiv is imported on first fetch
+ARXIV_AVAILABLE = importlib.util.find_spec('arxiv') is not None
+if not ARXIV_AVAILABLE:
+    logging.info("ArXiv not available - using sample papers")
+
+# Vector database integration; only probed, so summaries never pay for importing it
+VECTOR_DB_AVAILABLE = importlib.util.find_spec('vector_db') is not None
+
+# Multi-pattern keyword and concept scanning
 try:
-    import arxiv
-    ARXIV_AVAILABLE = True
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
 except ImportError:
-    ARXIV_AVAILABLE = False
-    logging.info("ArXiv not available - using sample papers")
+    HYPERSCAN_AVAILABLE = False
 
-# Vector database integration
+# orjson serializes the indented paper snapshots much faster than the stdlib encoder
 try:
-    from vector_db import VectorStore
-    VECTOR_DB_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    VECTOR_DB_AVAILABLE = False
+    ORJSON_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Mathematical finance terms; each one present adds half a point of relevance
+_MATH_TERMS = (
+    'stochastic', 'brownian', 'diffusion', 'volatility', 'correlation',
+    'optimization', 'numerical', 'algorithm', 'model', 'pricing'
+)
+
+# Weighted keywords for paper ranking
+_HIGH_VALUE_KEYWORDS = (
+    'black-scholes', 'value at risk', 'portfolio optimization',
+    'monte carlo', 'option pricing', 'risk management'
+)
+_MEDIUM_VALUE_KEYWORDS = (
+    'derivative', 'volatility', 'stochastic', 'optimization',
+    'financial', 'quantitative', 'trading', 'market'
+)
+
+# Points per distinct keyword found, by scan group
+_RELEVANCE_FILTER_WEIGHTS = {'english': 1.0, 'spanish': 1.0, 'math': 0.5}
+_RANKING_WEIGHTS = {'high': 3.0, 'medium': 1.0}
+
+# Common Spanish words; any one of them marks a paper as (partly) Spanish
+_SPANISH_INDICATORS = (
+    'finanzas', 'riesgo', 'modelo', 'análisis', 'mercado',
+    'precio', 'valor', 'gestión', 'optimización'
+)
+_SPANISH_INDICATORS_RE = re.compile('|'.join(map(re.escape, _SPANISH_INDICATORS)))
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize dataclass records as dicts and anything else, such as datetimes, as str."""
+    if is_dataclass(value):
+        return asdict(value)
+    return str(value)
+
+
+def _write_json(path: Path, data: Any) -> None:
+    """Write data as indented UTF-8 JSON; unknown types such as datetimes are stringified.
+    
+    The file is written under a temporary name and renamed into place, so concurrent
+    readers never see a partial snapshot.
+    """
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    if ORJSON_AVAILABLE:
+        # Pass datetimes through to str() so files match the stdlib output
+        tmp_path.write_bytes(orjson.dumps(
+            data, default=_json_default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME
+        ))
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=_json_default)
+    os.replace(tmp_path, path)
+
+
+@lru_cache(maxsize=1)
+def _load_arxiv():
+    """Import arxiv on first use; returns the module or None."""
+    if not ARXIV_AVAILABLE:
+        return None
+    try:
+        import arxiv
+    except ImportError:
+        return None
+    return arxiv
+
+
+def _weighted_keyword_score(matches: Dict[str, frozenset], weights: Dict[str, float]) -> float:
+    """Dot product of the per-group keyword counts of a scan with a weight table."""
+    return sum(weight * len(matches.get(group, ())) for group, weight in weights.items())
+
+
+@lru_cache(maxsize=4)
+def _load_papers_snapshot(path: str, mtime_ns: int) -> tuple:
+    """
+    Parse a papers file and index its concepts and languages.
+    
+    Cached per (path, mtime_ns), so a file is only re-read after it changes.
+    
+    Returns:
+        Tuple of (papers, top_concepts, languages)
+    """
+    if ORJSON_AVAILABLE:
+        papers = orjson.loads(Path(path).read_bytes())
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            papers = json.load(f)
+    
+    # Count concept and language frequencies straight from the papers
+    concept_counts = Counter(concept for paper in papers
+                             for concept in paper.get('extracted_concepts', ()))
+    language_counts = Counter(language for paper in papers
+                              for language in paper.get('languages', ('en',)))
+    
+    return (tuple(papers),
+            tuple(concept_counts.keys())[:10],
+            tuple(language_counts.keys()))
+
+
+@dataclass(frozen=True, slots=True)
+class ProcessedPaper:
+    """An arXiv paper with its relevance score, concepts and languages."""
+    title: str
+    authors: List[str]
+    published: datetime
+    updated: datetime
+    summary: str
+    arxiv_id: str
+    pdf_url: str
+    categories: List[str]
+    relevance_score: float
+    extracted_concepts: List[str]
+    languages: List[str]
+    processing_timestamp: str
+
 
 class EnhancedPaperIntegrator:
     """Enhanced system for fetching and integrating financial papers."""
@@ -104,8 +233,95 @@ class EnhancedPaperIntegrator:
             ]
         }
         
+        # Keywords are fixed strings: substring checks beat a regex scan over the text
+        self._keyword_groups = {
+            group: frozenset(keyword.lower() for keyword in keywords)
+            for group, keywords in (('english', self.english_keywords),
+                                    ('spanish', self.spanish_keywords),
+                                    ('math', _MATH_TERMS),
+                                    ('high', _HIGH_VALUE_KEYWORDS),
+                                    ('medium', _MEDIUM_VALUE_KEYWORDS))
+        }
+        # One pass per concept instead of one per pattern
+        self._concept_res = {
+            concept: re.compile('|'.join(patterns), re.IGNORECASE)
+            for concept, patterns in self.concept_patterns.items()
+        }
+        
+        # Flattened (group, label, pattern) list; the index doubles as the hyperscan pattern id
+        self._pattern_ids = [
+            (group, keyword, re.escape(keyword))
+            for group, keywords in self._keyword_groups.items()
+            for keyword in sorted(keywords)
+        ]
+        self._pattern_ids.extend(
+            ('concept', concept, pattern)
+            for concept, patterns in self.concept_patterns.items()
+            for pattern in patterns
+        )
+        self._pattern_database = self._compile_pattern_database()
+        # Hyperscan scratch space cannot be shared by concurrent scans; keep one per thread
+        self._scan_local = threading.local()
+        
+        # Relevance filtering and processing look at the same text; scan it once
+        self._match_groups = lru_cache(maxsize=256)(self._scan_text)
+        
         logger.info("🚀 Enhanced Paper Integrator initialized")
     
+    def _compile_pattern_database(self):
+        """Compile all keyword and concept patterns into one hyperscan database, if available."""
+        if not HYPERSCAN_AVAILABLE:
+            return None
+        
+        # No HS_FLAG_UCP: hyperscan rejects \b in UCP mode, and the concept patterns are ASCII
+        base_flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_SINGLEMATCH
+        try:
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[pattern.encode('utf-8') for _, _, pattern in self._pattern_ids],
+                ids=list(range(len(self._pattern_ids))),
+                elements=len(self._pattern_ids),
+                flags=[base_flags | hyperscan.HS_FLAG_CASELESS if group == 'concept' else base_flags
+                       for group, _, _ in self._pattern_ids]
+            )
+            return database
+        except Exception as e:
+            logger.warning(f"Hyperscan paper database unavailable, using compiled regexes: {e}")
+            return None
+    
+    def _scan_text(self, text: str) -> Dict[str, frozenset]:
+        """Map each pattern group to the labels of its patterns found in lowercased text."""
+        if self._pattern_database is not None:
+            # Single pass over the text; SINGLEMATCH reports each pattern at most once
+            scratch = getattr(self._scan_local, 'scratch', None)
+            if scratch is None:
+                scratch = self._scan_local.scratch = hyperscan.Scratch(self._pattern_database)
+            matched_ids = set()
+            self._pattern_database.scan(
+                text.encode('utf-8'),
+                match_event_handler=lambda pattern_id, *_: matched_ids.add(pattern_id),
+                scratch=scratch
+            )
+            groups = {}
+            for pattern_id in matched_ids:
+                group, label, _ = self._pattern_ids[pattern_id]
+                groups.setdefault(group, set()).add(label)
+            return {group: frozenset(labels) for group, labels in groups.items()}
+        
+        groups = {
+            group: frozenset(keyword for keyword in keywords if keyword in text)
+            for group, keywords in self._keyword_groups.items()
+        }
+        groups['concept'] = frozenset(
+            concept for concept, pattern in self._concept_res.items() if pattern.search(text)
+        )
+        return groups
+    
+    @staticmethod
+    def _paper_text(paper) -> str:
+        """Lowercased title and summary, the text all keyword and concept checks run on."""
+        return f"{paper.title} {paper.summary}".lower()
+    
     async def fetch_and_process_papers(self, days_back: int = 3, max_papers: int = 50) -> Dict[str, Any]:
         """
         Fetch and process recent papers with enhanced filtering.
@@ -117,66 +333,66 @@ class EnhancedPaperIntegrator:
         Returns:
             Dictionary with processing results
         """
-        if not ARXIV_AVAILABLE:
+        if _load_arxiv() is None:
             logger.warning("ArXiv not available - creating sample papers")
             return self._create_sample_papers()
         
         try:
             logger.info(f"🔍 Fetching papers from last {days_back} days...")
+            start_perf = time.perf_counter()
             
-            all_papers = []
-            cutoff_date = datetime.now() - timedelta(days=days_back)
+            batch_time = datetime.now()
+            cutoff_date = batch_time - timedelta(days=days_back)
+            # All papers of a batch share one processing timestamp
+            processed_at = batch_time.isoformat()
+            max_results = max_papers // len(self.categories)
             
-            # Fetch from multiple categories
-            for category in self.categories[:6]:  # Limit to main finance categories
-                try:
-                    logger.info(f"📚 Searching category: {category}")
-                    
-                    # Build search query
-                    search = arxiv.Search(
-                        query=f"cat:{category}",
-                        max_results=max_papers // len(self.categories),
-                        sort_by=arxiv.SortCriterion.SubmittedDate,
-                        sort_order=arxiv.SortOrder.Descending
-                    )
+            # Fetch from multiple categories concurrently; each search is blocking I/O
+            categories = self.categories[:6]  # Limit to main finance categories
+            results = await asyncio.gather(
+                *(asyncio.to_thread(self._fetch_category, category, max_results, cutoff_date)
+                  for category in categories),
+                return_exceptions=True
+            )
+            
+            all_papers = []
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                for category, category_results in zip(categories, results):
+                    if isinstance(category_results, Exception):
+                        logger.error(f"Error fetching from {category}: {category_results}")
+                        continue
                     
-                    papers_found = 0
-                    for paper in search.results():
-                        if paper.published.replace(tzinfo=None) < cutoff_date:
-                            break
-                        
-                        # Enhanced relevance filtering
-                        if self._is_relevant_paper(paper):
-                            processed_paper = self._process_paper(paper)
-                            all_papers.append(processed_paper)
-                            papers_found += 1
-                        
-                        if papers_found >= 10:  # Limit per category
-                            break
+                    # Lowercase each paper once; filtering and processing share the text
+                    candidates = ((paper, self._paper_text(paper)) for paper in category_results)
                     
-                    logger.info(f"✅ Found {papers_found} relevant papers in {category}")
+                    # Enhanced relevance filtering, limited to 10 papers per category
+                    relevant = list(islice(((paper, text) for paper, text in candidates
+                                            if self._is_relevant_paper(paper, text)), 10))
+                    processed = list(executor.map(self._process_paper,
+                                                  [paper for paper, _ in relevant],
+                                                  [text for _, text in relevant],
+                                                  repeat(processed_at)))
+                    all_papers.extend(processed)
                     
-                except Exception as e:
-                    logger.error(f"Error fetching from {category}: {e}")
-                    continue
+                    logger.info(f"✅ Found {len(processed)} relevant papers in {category}")
             
             # Sort by relevance score and published date
-            all_papers.sort(key=lambda x: (x['relevance_score'], x['published']), reverse=True)
+            all_papers.sort(key=lambda x: (x.relevance_score, x.published), reverse=True)
             all_papers = all_papers[:max_papers]
             
             # Save processed papers
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_file = self.data_dir / f"papers_{timestamp}.json"
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(all_papers, f, indent=2, ensure_ascii=False, default=str)
-            
             # Extract and save knowledge concepts
             knowledge_concepts = self._extract_knowledge_concepts(all_papers)
             concepts_file = self.processed_dir / f"concepts_{timestamp}.json"
             
-            with open(concepts_file, 'w', encoding='utf-8') as f:
-                json.dump(knowledge_concepts, f, indent=2, ensure_ascii=False)
+            # Both snapshots are written off the event loop and are on disk before returning
+            await asyncio.gather(
+                asyncio.to_thread(_write_json, output_file, all_papers),
+                asyncio.to_thread(_write_json, concepts_file, knowledge_concepts)
+            )
             
             logger.info(f"✅ Successfully processed {len(all_papers)} papers")
             logger.info(f"📁 Saved to: {output_file}")
@@ -189,7 +405,7 @@ class EnhancedPaperIntegrator:
                 'concepts_extracted': len(knowledge_concepts),
                 'concepts_file': str(concepts_file),
                 'categories_searched': len(self.categories),
-                'processing_time': time.time()
+                'processing_time': time.perf_counter() - start_perf
             }
             
         except Exception as e:
@@ -200,91 +416,69 @@ class EnhancedPaperIntegrator:
                 'papers_processed': 0
             }
     
-    def _is_relevant_paper(self, paper) -> bool:
+    def _fetch_category(self, category: str, max_results: int, cutoff_date: datetime) -> list:
+        """Fetch the papers of one category published after cutoff_date, newest first."""
+        arxiv = _load_arxiv()
+        logger.info(f"📚 Searching category: {category}")
+        
+        # Build search query
+        search = arxiv.Search(
+            query=f"cat:{category}",
+            max_results=max_results,
+            sort_by=arxiv.SortCriterion.SubmittedDate,
+            sort_order=arxiv.SortOrder.Descending
+        )
+        
+        # Materialize the raw results first so network paging never interleaves with processing
+        recent = takewhile(lambda paper: paper.published.replace(tzinfo=None) >= cutoff_date,
+                           search.results())
+        return list(islice(recent, max_results))
+    
+    def _is_relevant_paper(self, paper, combined_text: Optional[str] = None) -> bool:
         """Enhanced relevance checking for papers."""
-        title = paper.title.lower()
-        summary = paper.summary.lower()
-        combined_text = f"{title} {summary}"
-        
-        # Check for financial keywords
-        keyword_score = 0
-        
-        # English keywords
-        for keyword in self.english_keywords:
-            if keyword.lower() in combined_text:
-                keyword_score += 1
+        matches = self._match_groups(combined_text or self._paper_text(paper))
         
-        # Spanish keywords
-        for keyword in self.spanish_keywords:
-            if keyword.lower() in combined_text:
-                keyword_score += 1
-        
-        # Check for mathematical finance terms
-        math_terms = [
-            'stochastic', 'brownian', 'diffusion', 'volatility', 'correlation',
-            'optimization', 'numerical', 'algorithm', 'model', 'pricing'
-        ]
-        
-        for term in math_terms:
-            if term in combined_text:
-                keyword_score += 0.5
+        # Check for financial keywords and mathematical finance terms
+        keyword_score = _weighted_keyword_score(matches, _RELEVANCE_FILTER_WEIGHTS)
         
         # Minimum threshold for relevance
         return keyword_score >= 2
     
-    def _process_paper(self, paper) -> Dict[str, Any]:
+    def _process_paper(self, paper, combined_text: Optional[str] = None,
+                       processed_at: Optional[str] = None) -> ProcessedPaper:
         """Process and enhance paper information."""
+        combined_text = combined_text or self._paper_text(paper)
+        
         # Calculate relevance score
-        relevance_score = self._calculate_relevance_score(paper)
+        relevance_score = self._calculate_relevance_score(paper, combined_text)
         
         # Extract key concepts
-        concepts = self._extract_paper_concepts(paper)
+        concepts = self._extract_paper_concepts(paper, combined_text)
         
         # Determine languages
-        languages = self._detect_paper_languages(paper)
-        
-        return {
-            'title': paper.title,
-            'authors': [author.name for author in paper.authors],
-            'published': paper.published,
-            'updated': paper.updated,
-            'summary': paper.summary,
-            'arxiv_id': paper.entry_id.split('/')[-1],
-            'pdf_url': paper.pdf_url,
-            'categories': paper.categories,
-            'relevance_score': relevance_score,
-            'extracted_concepts': concepts,
-            'languages': languages,
-            'processing_timestamp': datetime.now().isoformat()
-        }
+        languages = self._detect_paper_languages(paper, combined_text)
+        
+        return ProcessedPaper(
+            title=paper.title,
+            authors=[author.name for author in paper.authors],
+            published=paper.published,
+            updated=paper.updated,
+            summary=paper.summary,
+            arxiv_id=paper.entry_id.split('/')[-1],
+            pdf_url=paper.pdf_url,
+            categories=paper.categories,
+            relevance_score=relevance_score,
+            extracted_concepts=concepts,
+            languages=languages,
+            processing_timestamp=processed_at or datetime.now().isoformat()
+        )
     
-    def _calculate_relevance_score(self, paper) -> float:
+    def _calculate_relevance_score(self, paper, combined_text: Optional[str] = None) -> float:
         """Calculate relevance score for paper ranking."""
-        title = paper.title.lower()
-        summary = paper.summary.lower()
-        combined_text = f"{title} {summary}"
-        
-        score = 0.0
-        
-        # High-value keywords (higher weight)
-        high_value_keywords = [
-            'black-scholes', 'value at risk', 'portfolio optimization',
-            'monte carlo', 'option pricing', 'risk management'
-        ]
+        matches = self._match_groups(combined_text or self._paper_text(paper))
         
-        for keyword in high_value_keywords:
-            if keyword in combined_text:
-                score += 3.0
-        
-        # Medium-value keywords
-        medium_value_keywords = [
-            'derivative', 'volatility', 'stochastic', 'optimization',
-            'financial', 'quantitative', 'trading', 'market'
-        ]
-        
-        for keyword in medium_value_keywords:
-            if keyword in combined_text:
-                score += 1.0
+        # High-value keywords weigh 3, medium-value keywords 1
+        score = _weighted_keyword_score(matches, _RANKING_WEIGHTS)
         
         # Recency bonus (more recent papers get higher scores)
         days_old = (datetime.now() - paper.published.replace(tzinfo=None)).days
@@ -295,92 +489,66 @@ class EnhancedPaperIntegrator:
         
         return round(score, 2)
     
-    def _extract_paper_concepts(self, paper) -> List[str]:
+    def _extract_paper_concepts(self, paper, combined_text: Optional[str] = None) -> List[str]:
         """Extract financial concepts from paper."""
-        title = paper.title.lower()
-        summary = paper.summary.lower()
-        combined_text = f"{title} {summary}"
-        
-        found_concepts = []
-        
-        for concept, patterns in self.concept_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, combined_text, re.IGNORECASE):
-                    found_concepts.append(concept)
-                    break
-        
-        return list(set(found_concepts))
+        matches = self._match_groups(combined_text or self._paper_text(paper))
+        return list(matches.get('concept', ()))
     
-    def _detect_paper_languages(self, paper) -> List[str]:
+    def _detect_paper_languages(self, paper, combined_text: Optional[str] = None) -> List[str]:
         """Detect languages present in paper."""
-        # Simple heuristic based on common words
-        title = paper.title.lower()
-        summary = paper.summary.lower()
-        
         languages = ['en']  # Default to English
         
-        # Check for Spanish indicators
-        spanish_indicators = [
-            'finanzas', 'riesgo', 'modelo', 'análisis', 'mercado',
-            'precio', 'valor', 'gestión', 'optimización'
-        ]
-        
-        if any(indicator in f"{title} {summary}" for indicator in spanish_indicators):
+        # Simple heuristic based on common Spanish words
+        if _SPANISH_INDICATORS_RE.search(combined_text or self._paper_text(paper)):
             languages.append('es')
         
         return languages
     
-    def _extract_knowledge_concepts(self, papers: List[Dict]) -> Dict[str, Any]:
+    def _extract_knowledge_concepts(self, papers: List[ProcessedPaper]) -> Dict[str, Any]:
         """Extract structured knowledge concepts from all papers."""
-        knowledge = {
-            'concepts': {},
-            'authors': {},
-            'trending_topics': [],
-            'methodologies': {},
-            'applications': {}
-        }
+        concept_freq = Counter()
+        concept_papers = defaultdict(list)
+        author_papers = defaultdict(list)
+        author_concepts = defaultdict(set)
         
         # Process each paper
         for paper in papers:
+            concepts = paper.extracted_concepts
+            
             # Concept extraction
-            for concept in paper.get('extracted_concepts', []):
-                if concept not in knowledge['concepts']:
-                    knowledge['concepts'][concept] = {
-                        'papers': [],
-                        'frequency': 0,
-                        'recent_developments': []
-                    }
-                
-                knowledge['concepts'][concept]['papers'].append({
-                    'title': paper['title'][:100],
-                    'authors': paper['authors'][:3],
-                    'arxiv_id': paper['arxiv_id'],
-                    'relevance_score': paper['relevance_score']
+            concept_freq.update(concepts)
+            for concept in concepts:
+                concept_papers[concept].append({
+                    'title': paper.title[:100],
+                    'authors': paper.authors[:3],
+                    'arxiv_id': paper.arxiv_id,
+                    'relevance_score': paper.relevance_score
                 })
-                knowledge['concepts'][concept]['frequency'] += 1
             
             # Author tracking
-            for author in paper['authors'][:3]:  # Limit to first 3 authors
-                if author not in knowledge['authors']:
-                    knowledge['authors'][author] = {
-                        'papers': [],
-                        'concepts': set()
-                    }
-                
-                knowledge['authors'][author]['papers'].append(paper['title'][:50])
-                knowledge['authors'][author]['concepts'].update(paper.get('extracted_concepts', []))
-        
-        # Convert sets to lists for JSON serialization
-        for author_data in knowledge['authors'].values():
-            author_data['concepts'] = list(author_data['concepts'])
-        
-        # Find trending topics (most frequent concepts)
-        concept_frequencies = [(concept, data['frequency']) 
-                             for concept, data in knowledge['concepts'].items()]
-        concept_frequencies.sort(key=lambda x: x[1], reverse=True)
-        knowledge['trending_topics'] = [concept for concept, freq in concept_frequencies[:10]]
+            for author in paper.authors[:3]:  # Limit to first 3 authors
+                author_papers[author].append(paper.title[:50])
+                author_concepts[author].update(concepts)
         
-        return knowledge
+        return {
+            'concepts': {
+                concept: {
+                    'papers': concept_entries,
+                    'frequency': concept_freq[concept],
+                    'recent_developments': []
+                }
+                for concept, concept_entries in concept_papers.items()
+            },
+            # Sets become lists for JSON serialization
+            'authors': {
+                author: {'papers': titles, 'concepts': list(author_concepts[author])}
+                for author, titles in author_papers.items()
+            },
+            # Find trending topics (most frequent concepts)
+            'trending_topics': [concept for concept, _ in concept_freq.most_common(10)],
+            'methodologies': {},
+            'applications': {}
+        }
     
     def _create_sample_papers(self) -> Dict[str, Any]:
         """Create sample papers when ArXiv is not available."""
@@ -421,8 +589,7 @@ class EnhancedPaperIntegrator:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = self.data_dir / f"papers_{timestamp}.json"
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(sample_papers, f, indent=2, ensure_ascii=False, default=str)
+        _write_json(output_file, sample_papers)
         
         logger.info("✅ Created sample papers for demonstration")
         
@@ -437,40 +604,28 @@ class EnhancedPaperIntegrator:
     def get_latest_papers_summary(self) -> Dict[str, Any]:
         """Get summary of latest processed papers."""
         try:
-            paper_files = list(self.data_dir.glob("papers_*.json"))
-            if not paper_files:
+            # DirEntry caches its stat result, so each snapshot is stat'ed only once
+            with os.scandir(self.data_dir) as entries:
+                paper_entries = [entry for entry in entries
+                                 if entry.name.startswith('papers_') and entry.name.endswith('.json')]
+            if not paper_entries:
                 return {'papers': [], 'summary': 'No papers available'}
             
-            latest_file = max(paper_files, key=lambda x: x.stat().st_mtime)
+            latest_entry = max(paper_entries, key=lambda entry: entry.stat().st_mtime)
+            latest_stat = latest_entry.stat()
             
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                papers = json.load(f)
+            papers, top_concepts, languages = _load_papers_snapshot(latest_entry.path,
+                                                                   latest_stat.st_mtime_ns)
             
-            # Create summary
+            # Create summary; lists are copied so callers cannot alter the cached snapshot
             summary = {
                 'total_papers': len(papers),
-                'last_update': datetime.fromtimestamp(latest_file.stat().st_mtime).isoformat(),
-                'top_concepts': [],
-                'languages': [],
-                'recent_papers': papers[:5]  # First 5 papers
+                'last_update': datetime.fromtimestamp(latest_stat.st_mtime).isoformat(),
+                'top_concepts': list(top_concepts),
+                'languages': list(languages),
+                'recent_papers': copy.deepcopy(list(papers[:5]))  # First 5 papers
             }
             
-            # Extract concepts and languages
-            all_concepts = []
-            all_languages = []
-            
-            for paper in papers:
-                all_concepts.extend(paper.get('extracted_concepts', []))
-                all_languages.extend(paper.get('languages', ['en']))
-            
-            # Count frequencies
-            from collections import Counter
-            concept_counts = Counter(all_concepts)
-            language_counts = Counter(all_languages)
-            
-            summary['top_concepts'] = list(concept_counts.keys())[:10]
-            summary['languages'] = list(language_counts.keys())
-            
             return summary
             
         except Exception as e:
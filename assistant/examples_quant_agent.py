@@ -7,360 +7,544 @@ Demonstrates advanced capabilities and best practices
 import os
 import sys
 import json
+import asyncio
+import heapq
+import io
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache, wraps
+from operator import itemgetter
+from typing import Optional
+
+# Vectorized token index for the mock retriever
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# JIT compilation for the keyword-overlap scorer
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+# orjson encodes the results file in C; the stdlib encoder is the fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(__file__))
 
+# Word tokens used by the mock retriever; punctuation never blocks a match
+_TOKEN_RE = re.compile(r"\w+")
+
+def _tokenize(text):
+    """Lowercased set of word tokens in text."""
+    return set(_TOKEN_RE.findall(text.lower()))
+
+def _build_token_index(doc_tokens):
+    """Map tokens to ids; returns (vocab, sorted per-document ids flattened, offsets)."""
+    vocab = {token: token_id for token_id, token in enumerate(sorted(set().union(*doc_tokens)))}
+    doc_ids = [sorted(vocab[token] for token in tokens) for tokens in doc_tokens]
+    offsets = np.zeros(len(doc_ids) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(ids) for ids in doc_ids])
+    flat_ids = np.array([token_id for ids in doc_ids for token_id in ids], dtype=np.int32)
+    return vocab, flat_ids, offsets
+
+def _overlap_counts(query_ids, doc_ids, doc_offsets):
+    """Count the query ids in each document by two-pointer intersection of sorted id arrays."""
+    n_docs = doc_offsets.shape[0] - 1
+    counts = np.zeros(n_docs, dtype=np.int32)
+    for d in prange(n_docs):
+        i = 0
+        j = doc_offsets[d]
+        end = doc_offsets[d + 1]
+        matches = 0
+        while i < query_ids.shape[0] and j < end:
+            if query_ids[i] == doc_ids[j]:
+                matches += 1
+                i += 1
+                j += 1
+            elif query_ids[i] < doc_ids[j]:
+                i += 1
+            else:
+                j += 1
+        counts[d] = matches
+    return counts
+
+def _overlap_counts_numpy(query_ids, doc_ids, doc_offsets):
+    """Vectorized _overlap_counts for when numba is unavailable."""
+    hits = np.zeros(doc_ids.shape[0] + 1, dtype=np.int32)
+    np.cumsum(np.isin(doc_ids, query_ids), out=hits[1:])
+    return hits[doc_offsets[1:]] - hits[doc_offsets[:-1]]
+
+if NUMBA_AVAILABLE:
+    _overlap_counts = njit(parallel=True, cache=True)(_overlap_counts)
+elif NUMPY_AVAILABLE:
+    _overlap_counts = _overlap_counts_numpy
+
+@lru_cache(maxsize=1)
+def _mock_documents():
+    """Simulated knowledge base of financial documents, shared by every mock store."""
+    from langchain.schema import Document
+    
+    return (
+        Document(
+            page_content="The Black-Scholes model is a mathematical model for pricing European-style options...",
+            metadata={
+                "title": "Option Pricing Theory",
+                "authors": ["Fischer Black", "Myron Scholes"],
+                "source": "black_scholes_1973.pdf",
+                "type": "academic_paper"
+            }
+        ),
+        Document(
+            page_content="Value at Risk (VaR) is a statistical measure of the risk of loss for investments...",
+            metadata={
+                "title": "Risk Management in Finance",
+                "authors": ["Philippe Jorion"],
+                "source": "risk_management_2007.pdf",
+                "type": "textbook"
+            }
+        ),
+        Document(
+            page_content="Portfolio optimization seeks to maximize expected return for a given level of risk...",
+            metadata={
+                "title": "Modern Portfolio Theory",
+                "authors": ["Harry Markowitz"],
+                "source": "markowitz_1952.pdf",
+                "type": "academic_paper"
+            }
+        )
+    )
+
 def create_mock_vector_store():
     """Create a mock vector store for demonstration."""
-    from langchain.schema import Document
     
+    @dataclass(frozen=True, slots=True, eq=False)  # Hashed by identity as an agent cache key
     class MockVectorStore:
-        def __init__(self):
-            # Simulate a knowledge base with financial documents
-            self.documents = [
-                Document(
-                    page_content="The Black-Scholes model is a mathematical model for pricing European-style options...",
-                    metadata={
-                        "title": "Option Pricing Theory",
-                        "authors": ["Fischer Black", "Myron Scholes"],
-                        "source": "black_scholes_1973.pdf",
-                        "type": "academic_paper"
-                    }
-                ),
-                Document(
-                    page_content="Value at Risk (VaR) is a statistical measure of the risk of loss for investments...",
-                    metadata={
-                        "title": "Risk Management in Finance",
-                        "authors": ["Philippe Jorion"],
-                        "source": "risk_management_2007.pdf",
-                        "type": "textbook"
-                    }
-                ),
-                Document(
-                    page_content="Portfolio optimization seeks to maximize expected return for a given level of risk...",
-                    metadata={
-                        "title": "Modern Portfolio Theory",
-                        "authors": ["Harry Markowitz"],
-                        "source": "markowitz_1952.pdf",
-                        "type": "academic_paper"
-                    }
-                )
-            ]
+        documents: tuple
+        # Lowercased token set per document, built once instead of on every query
+        doc_tokens: tuple
+        # Integer form of the same tokens for the array scorer
+        token_index: Optional[tuple]
+        # Shared by every retriever of this store
+        query_cache: "MockSemanticCache"
         
         def as_retriever(self, **kwargs):
-            return MockRetriever(self.documents)
+            k = kwargs.get("search_kwargs", {}).get("k", 5)
+            return MockRetriever(self.documents, self.doc_tokens, self.query_cache, self.token_index, k)
+    
+    class MockSemanticCache:
+        # Stands in for an embedding cache: a query's token set is its one-hot embedding,
+        # and near-duplicate queries (cosine >= threshold) reuse an earlier result
+        def __init__(self, threshold=0.9, max_entries=128, ttl=300):
+            self.threshold = threshold
+            self.max_entries = max_entries
+            self.ttl = ttl
+            self.entries = OrderedDict()  # (k, frozenset of tokens) -> (stored_at, documents)
+            self.lock = threading.Lock()  # Retrievers may be queried from several threads
+        
+        @staticmethod
+        def similarity(a, b):
+            # Cosine similarity of two one-hot token vectors
+            if not a or not b:
+                return 0.0
+            return len(a & b) / (len(a) * len(b)) ** 0.5
+        
+        def get(self, tokens, k):
+            now = time.monotonic()
+            with self.lock:
+                for key, (stored_at, documents) in list(self.entries.items()):
+                    if now - stored_at > self.ttl:
+                        del self.entries[key]
+                        continue
+                    if key[0] == k and self.similarity(key[1], tokens) >= self.threshold:
+                        self.entries.move_to_end(key)
+                        return documents
+            return None
+        
+        def put(self, tokens, k, documents):
+            key = (k, tokens)
+            with self.lock:
+                self.entries[key] = (time.monotonic(), documents)
+                self.entries.move_to_end(key)
+                if len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
     
+    @dataclass(frozen=True, slots=True)
     class MockRetriever:
-        def __init__(self, documents):
-            self.documents = documents
+        documents: tuple
+        doc_tokens: tuple
+        cache: Optional[MockSemanticCache] = None
+        token_index: Optional[tuple] = None
+        k: int = 5
         
         def get_relevant_documents(self, query):
-            # Simple keyword matching for demonstration
-            query_lower = query.lower()
-            relevant = []
+            query_words = frozenset(_tokenize(query))
+            if self.cache is not None:
+                cached = self.cache.get(query_words, self.k)
+                if cached is not None:
+                    return list(cached)
             
-            for doc in self.documents:
-                if any(word in doc.page_content.lower() for word in query_lower.split()):
-                    relevant.append(doc)
+            # Simple keyword matching for demonstration: score is the shared-token count
+            if self.token_index is not None:
+                vocab, doc_ids, doc_offsets = self.token_index
+                query_ids = np.array(sorted(vocab[word] for word in query_words if word in vocab),
+                                     dtype=np.int32)
+                scores = _overlap_counts(query_ids, doc_ids, doc_offsets).tolist()
+            else:
+                scores = [len(query_words & tokens) for tokens in self.doc_tokens]
             
-            return relevant[:5]  # Return top 5 matches
+            # Top k matches in O(n log k); ties keep document order
+            scored = ((doc, score) for doc, score in zip(self.documents, scores) if score)
+            relevant = [doc for doc, _ in heapq.nlargest(self.k, scored, key=itemgetter(1))]
+            
+            if self.cache is not None:
+                self.cache.put(query_words, self.k, tuple(relevant))
+            return relevant
+    
+    documents = _mock_documents()
+    doc_tokens = tuple(frozenset(_tokenize(doc.page_content)) for doc in documents)
+    token_index = _build_token_index(doc_tokens) if NUMPY_AVAILABLE else None
+    return MockVectorStore(documents, doc_tokens, token_index, MockSemanticCache())
+
+# Config key for agents whose queries run concurrently through _gather_queries
+_MEMORYLESS_CONFIG = (("enable_memory", False),)
+
+@lru_cache(maxsize=8)
+def _build_agent(vector_store, config_key):
+    """Agent for a store and config, built once; see _get_agent."""
+    from quant_agent import EnhancedQuantFinanceAgent
+    return EnhancedQuantFinanceAgent(vector_store, dict(config_key) or None)
+
+def _get_agent(vector_store, config_key=()):
+    """Agent for a store and config, reused across examples but starting a fresh session.
+    
+    config_key is tuple(sorted(config.items())); the empty tuple selects the defaults.
+    The model stays loaded; memory, history and metrics from earlier examples are cleared.
+    """
+    agent = _build_agent(vector_store, config_key)
+    agent.clear_memory()
+    agent.reset_metrics()
+    return agent
+
+def safe_example(fn):
+    """Report an example's exception and return None instead of raising."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            print(f"Error in {fn.__name__.removeprefix('example_').replace('_', ' ')}: {e}")
+            return None
+    return wrapper
+
+async def _gather_queries(agent, queries):
+    """Run independent agent queries concurrently in worker threads, preserving order.
     
-    return MockVectorStore()
+    The agent must be built without memory (see _MEMORYLESS_CONFIG): concurrent turns
+    would otherwise read and prune one shared chat history.
+    """
+    return await asyncio.gather(*(asyncio.to_thread(agent.query, query) for query in queries))
 
-def example_basic_usage():
+@safe_example
+def example_basic_usage(vector_store=None):
     """Demonstrate basic agent usage."""
     print("=== Basic Usage Example ===")
     
-    try:
-        from quant_agent import EnhancedQuantFinanceAgent
-        
-        # Initialize agent with mock vector store
+    # Initialize agent with mock vector store
+    if vector_store is None:
         vector_store = create_mock_vector_store()
-        agent = EnhancedQuantFinanceAgent(vector_store)
-        
-        # Simple query
-        query = "Explain the Black-Scholes option pricing model"
-        print(f"Query: {query}")
-        
-        result = agent.query(query)
-        
-        print(f"Response: {result['result'][:200]}...")
-        print(f"Sources: {len(result['source_documents'])} documents")
-        print(f"Response Time: {result['metadata']['response_time']:.2f}s")
-        
-        return agent
-        
-    except Exception as e:
-        print(f"Error in basic usage: {e}")
-        return None
+    agent = _get_agent(vector_store)
+    
+    # Simple query
+    query = "Explain the Black-Scholes option pricing model"
+    print(f"Query: {query}")
+    
+    result = agent.query(query)
+    
+    print(f"Response: {result['result'][:200]}...")
+    print(f"Sources: {len(result['source_documents'])} documents")
+    print(f"Response Time: {result['metadata']['response_time']:.2f}s")
+    
+    return agent
 
-def example_advanced_configuration():
+@safe_example
+def example_advanced_configuration(vector_store=None):
     """Demonstrate advanced configuration options."""
     print("\n=== Advanced Configuration Example ===")
     
-    try:
-        from quant_agent import EnhancedQuantFinanceAgent
-        
-        # Custom configuration for high-performance trading applications
-        trading_config = {
-            "model_name": "google/flan-t5-large",  # Faster model
-            "temperature": 0.05,  # More deterministic responses
-            "max_length": 256,    # Shorter responses for quick analysis
-            "top_k": 3,           # Fewer sources for speed
-            "enable_memory": True,
-            "enable_preprocessing": True,
-            "enable_postprocessing": True,
-            "response_timeout": 15
-        }
-        
+    # Custom configuration for high-performance trading applications
+    trading_config = {
+        "model_name": "google/flan-t5-large",  # Faster model
+        "temperature": 0.05,  # More deterministic responses
+        "max_length": 256,    # Shorter responses for quick analysis
+        "top_k": 3,           # Fewer sources for speed
+        "enable_memory": True,
+        "enable_preprocessing": True,
+        "enable_postprocessing": True,
+        "response_timeout": 15
+    }
+    
+    if vector_store is None:
         vector_store = create_mock_vector_store()
-        agent = EnhancedQuantFinanceAgent(vector_store, trading_config)
-        
-        print("Configuration applied:")
-        for key, value in trading_config.items():
-            print(f"  {key}: {value}")
-        
-        # Test with trading-specific query
-        query = "What's the optimal portfolio allocation for a risk-averse investor?"
-        result = agent.query(query)
-        
-        print(f"\nTrading Query Result:")
-        print(f"Response: {result['result'][:150]}...")
-        print(f"Financial Concepts: {result['metadata']['financial_concepts']}")
-        
-        return agent
-        
-    except Exception as e:
-        print(f"Error in advanced configuration: {e}")
-        return None
+    agent = _get_agent(vector_store, tuple(sorted(trading_config.items())))
+    
+    print("Configuration applied:")
+    for key, value in trading_config.items():
+        print(f"  {key}: {value}")
+    
+    # Test with trading-specific query
+    query = "What's the optimal portfolio allocation for a risk-averse investor?"
+    result = agent.query(query)
+    
+    print(f"\nTrading Query Result:")
+    print(f"Response: {result['result'][:150]}...")
+    print(f"Financial Concepts: {result['metadata']['financial_concepts']}")
+    
+    return agent
 
-def example_specialized_queries():
+@safe_example
+def example_specialized_queries(vector_store=None):
     """Demonstrate specialized query types."""
     print("\n=== Specialized Queries Example ===")
     
-    try:
-        from quant_agent import EnhancedQuantFinanceAgent
-        
+    if vector_store is None:
         vector_store = create_mock_vector_store()
-        agent = EnhancedQuantFinanceAgent(vector_store)
+    # Its queries run concurrently, so the agent keeps no conversation memory
+    agent = _get_agent(vector_store, _MEMORYLESS_CONFIG)
+    
+    specialized_queries = [
+        {
+            "category": "Risk Management",
+            "query": "Calculate 95% VaR for a $1M portfolio with 20% volatility",
+            "expected_concepts": ["VaR", "risk management", "volatility"]
+        },
+        {
+            "category": "Options Pricing",
+            "query": "Price a European call option with S=100, K=105, T=0.25, r=0.05, σ=0.2",
+            "expected_concepts": ["Black-Scholes", "option pricing", "Greeks"]
+        },
+        {
+            "category": "Portfolio Theory",
+            "query": "Optimize a 3-asset portfolio using mean-variance optimization",
+            "expected_concepts": ["Markowitz", "portfolio optimization", "efficient frontier"]
+        }
+    ]
+    
+    results = asyncio.run(_gather_queries(agent, [info['query'] for info in specialized_queries]))
+    
+    for query_info, result in zip(specialized_queries, results):
+        print(f"\n{query_info['category']} Query:")
+        print(f"Question: {query_info['query']}")
         
-        specialized_queries = [
-            {
-                "category": "Risk Management",
-                "query": "Calculate 95% VaR for a $1M portfolio with 20% volatility",
-                "expected_concepts": ["VaR", "risk management", "volatility"]
-            },
-            {
-                "category": "Options Pricing",
-                "query": "Price a European call option with S=100, K=105, T=0.25, r=0.05, σ=0.2",
-                "expected_concepts": ["Black-Scholes", "option pricing", "Greeks"]
-            },
-            {
-                "category": "Portfolio Theory",
-                "query": "Optimize a 3-asset portfolio using mean-variance optimization",
-                "expected_concepts": ["Markowitz", "portfolio optimization", "efficient frontier"]
-            }
-        ]
+        # Check if expected concepts are detected
+        detected_concepts = result['metadata']['financial_concepts']
+        expected_concepts = query_info['expected_concepts']
         
-        for query_info in specialized_queries:
-            print(f"\n{query_info['category']} Query:")
-            print(f"Question: {query_info['query']}")
-            
-            result = agent.query(query_info['query'])
-            
-            # Check if expected concepts are detected
-            detected_concepts = result['metadata']['financial_concepts']
-            expected_concepts = query_info['expected_concepts']
-            
-            matching_concepts = set(detected_concepts) & set(expected_concepts)
-            
-            print(f"Response: {result['result'][:100]}...")
-            print(f"Expected concepts: {expected_concepts}")
-            print(f"Detected concepts: {detected_concepts}")
-            print(f"Matching concepts: {list(matching_concepts)}")
-            print(f"Quality score: {result['metadata']['quality_metrics']}")
+        matching_concepts = set(detected_concepts) & set(expected_concepts)
         
-    except Exception as e:
-        print(f"Error in specialized queries: {e}")
+        print(f"Response: {result['result'][:100]}...")
+        print(f"Expected concepts: {expected_concepts}")
+        print(f"Detected concepts: {detected_concepts}")
+        print(f"Matching concepts: {list(matching_concepts)}")
+        print(f"Quality score: {result['metadata']['quality_metrics']}")
 
-def example_conversation_memory():
+@safe_example
+def example_conversation_memory(vector_store=None):
     """Demonstrate conversation memory capabilities."""
     print("\n=== Conversation Memory Example ===")
     
-    try:
-        from quant_agent import EnhancedQuantFinanceAgent
-        
-        # Enable memory for conversational context
-        memory_config = {
-            "enable_memory": True,
-            "memory_max_tokens": 1000
-        }
-        
+    # Enable memory for conversational context
+    memory_config = {
+        "enable_memory": True,
+        "memory_max_tokens": 1000
+    }
+    
+    if vector_store is None:
         vector_store = create_mock_vector_store()
-        agent = EnhancedQuantFinanceAgent(vector_store, memory_config)
-        
-        # Multi-turn conversation
-        conversation = [
-            "What is the Black-Scholes model?",
-            "How do you calculate the Greeks for this model?",
-            "Can you give me a practical example of delta hedging?",
-            "What are the limitations of this approach?"
-        ]
-        
-        print("Multi-turn conversation:")
-        for i, query in enumerate(conversation, 1):
-            print(f"\nTurn {i}: {query}")
-            result = agent.query(query, use_memory=True)
-            print(f"Response: {result['result'][:120]}...")
-        
-        # Show conversation summary
-        summary = agent.get_conversation_summary()
-        print(f"\nConversation Summary:")
-        print(f"Total queries: {summary['total_queries']}")
-        print(f"Recent topics: {summary['recent_topics']}")
-        print(f"Performance: {summary['performance']}")
-        
-    except Exception as e:
-        print(f"Error in conversation memory: {e}")
+    agent = _get_agent(vector_store, tuple(sorted(memory_config.items())))
+    
+    # Multi-turn conversation
+    conversation = [
+        "What is the Black-Scholes model?",
+        "How do you calculate the Greeks for this model?",
+        "Can you give me a practical example of delta hedging?",
+        "What are the limitations of this approach?"
+    ]
+    
+    print("Multi-turn conversation:")
+    results = agent.batch_query(conversation, use_memory=True)
+    for i, (query, result) in enumerate(zip(conversation, results), 1):
+        print(f"\nTurn {i}: {query}")
+        print(f"Response: {result['result'][:120]}...")
+    
+    # Show conversation summary
+    summary = agent.get_conversation_summary()
+    print(f"\nConversation Summary:")
+    print(f"Total queries: {summary['total_queries']}")
+    print(f"Recent topics: {summary['recent_topics']}")
+    print(f"Performance: {summary['performance']}")
 
-def example_performance_monitoring():
+@safe_example
+def example_performance_monitoring(vector_store=None):
     """Demonstrate performance monitoring and analytics."""
     print("\n=== Performance Monitoring Example ===")
     
-    try:
-        from quant_agent import EnhancedQuantFinanceAgent
-        
+    if vector_store is None:
         vector_store = create_mock_vector_store()
-        agent = EnhancedQuantFinanceAgent(vector_store)
-        
-        # Run several queries to generate performance data
-        test_queries = [
-            "Explain portfolio diversification",
-            "What is credit risk?",
-            "How does correlation affect portfolio risk?",
-            "Describe the efficient market hypothesis"
-        ]
-        
-        print("Running performance benchmark...")
-        for query in test_queries:
-            result = agent.query(query)
-            print(f"  ✓ Processed: {query[:30]}... ({result['metadata']['response_time']:.2f}s)")
-        
-        # Health check
-        health = agent.health_check()
-        print(f"\nHealth Check:")
-        for component, status in health['components'].items():
-            print(f"  {component}: {'✓' if status else '✗'}")
-        
-        # Performance summary
-        summary = agent.get_conversation_summary()
-        print(f"\nPerformance Summary:")
-        print(f"  Average response time: {summary['average_response_time']:.2f}s")
-        print(f"  Total queries processed: {summary['total_queries']}")
-        print(f"  Overall performance: {summary['performance']}")
-        
-    except Exception as e:
-        print(f"Error in performance monitoring: {e}")
+    # Its queries run concurrently, so the agent keeps no conversation memory
+    agent = _get_agent(vector_store, _MEMORYLESS_CONFIG)
+    
+    # Run several queries to generate performance data
+    test_queries = [
+        "Explain portfolio diversification",
+        "What is credit risk?",
+        "How does correlation affect portfolio risk?",
+        "Describe the efficient market hypothesis"
+    ]
+    
+    print("Running performance benchmark...")
+    results = asyncio.run(_gather_queries(agent, test_queries))
+    for query, result in zip(test_queries, results):
+        print(f"  ✓ Processed: {query[:30]}... ({result['metadata']['response_time']:.2f}s)")
+    
+    # Health check
+    health = agent.health_check()
+    print(f"\nHealth Check:")
+    for component, status in health['components'].items():
+        print(f"  {component}: {'✓' if status else '✗'}")
+    
+    # Performance summary
+    summary = agent.get_conversation_summary()
+    print(f"\nPerformance Summary:")
+    print(f"  Average response time: {summary['average_response_time']:.2f}s")
+    print(f"  Total queries processed: {summary['total_queries']}")
+    print(f"  Overall performance: {summary['performance']}")
 
-def example_error_handling():
+@safe_example
+def example_error_handling(vector_store=None):
     """Demonstrate error handling and fallback mechanisms."""
     print("\n=== Error Handling Example ===")
     
-    try:
-        from quant_agent import EnhancedQuantFinanceAgent
-        
+    from quant_agent import EnhancedQuantFinanceAgent
+    
+    if vector_store is None:
         vector_store = create_mock_vector_store()
-        agent = EnhancedQuantFinanceAgent(vector_store)
-        
-        # Test various error conditions
-        error_tests = [
-            ("Empty query", ""),
-            ("Very long query", "x" * 10000),
-            ("Non-financial query", "What's the weather like today?"),
-            ("Special characters", "∑∫∂∆∇∞±≈≠√∝∈∪∩⊂⊃∀∃∄∅"),
-        ]
-        
-        print("Testing error handling:")
-        for test_name, query in error_tests:
-            try:
-                result = agent.query(query)
-                error_status = result['metadata'].get('error', False)
-                print(f"  {test_name}: {'✓ Handled gracefully' if not error_status else '⚠ Error detected but handled'}")
-            except Exception as e:
-                print(f"  {test_name}: ✗ Unhandled error: {e}")
-        
-        # Test configuration updates
-        print("\nTesting dynamic configuration:")
-        try:
-            agent.update_config({"temperature": 0.7, "top_k": 10})
-            print("  ✓ Configuration updated successfully")
-        except Exception as e:
-            print(f"  ✗ Configuration update failed: {e}")
-        
+    # A private agent: update_config below must not leak into the shared ones.
+    # Its test queries run concurrently, so it keeps no conversation memory.
+    agent = EnhancedQuantFinanceAgent(vector_store, dict(_MEMORYLESS_CONFIG))
+    
+    # Test various error conditions
+    error_tests = [
+        ("Empty query", ""),
+        ("Very long query", "x" * 10000),
+        ("Non-financial query", "What's the weather like today?"),
+        ("Special characters", "∑∫∂∆∇∞±≈≠√∝∈∪∩⊂⊃∀∃∄∅"),
+    ]
+    
+    print("Testing error handling:")
+    # Empty and over-length queries are answered directly; the rest run concurrently
+    try:
+        results = asyncio.run(_gather_queries(agent, [query for _, query in error_tests]))
     except Exception as e:
-        print(f"Error in error handling demo: {e}")
+        print(f"  ✗ Unhandled error: {e}")
+        results = []
+    for (test_name, _), result in zip(error_tests, results):
+        error_status = result['metadata'].get('error', False)
+        fast_path = result['metadata'].get('fast_path')
+        status = '✓ Handled gracefully' if not error_status else '⚠ Error detected but handled'
+        print(f"  {test_name}: {status}" + (f" (fast path: {fast_path})" if fast_path else ""))
+    
+    # Test configuration updates
+    print("\nTesting dynamic configuration:")
+    try:
+        agent.update_config({"temperature": 0.7, "top_k": 10})
+        print("  ✓ Configuration updated successfully")
+    except Exception as e:
+        print(f"  ✗ Configuration update failed: {e}")
 
-def example_integration_patterns():
+@safe_example
+def example_integration_patterns(vector_store=None):
     """Demonstrate integration patterns for different use cases."""
     print("\n=== Integration Patterns Example ===")
     
-    try:
-        from quant_agent import EnhancedQuantFinanceAgent
-        
+    if vector_store is None:
         vector_store = create_mock_vector_store()
-        
-        # Pattern 1: Research Assistant
-        print("1. Research Assistant Pattern:")
-        research_config = {
-            "temperature": 0.1,
-            "max_length": 1024,
-            "top_k": 10,
-            "enable_memory": True
-        }
-        research_agent = EnhancedQuantFinanceAgent(vector_store, research_config)
-        
-        # Pattern 2: Trading Bot
-        print("2. Trading Bot Pattern:")
-        trading_config = {
-            "temperature": 0.05,
-            "max_length": 256,
-            "top_k": 3,
-            "enable_memory": False,
-            "response_timeout": 5
-        }
-        trading_agent = EnhancedQuantFinanceAgent(vector_store, trading_config)
-        
-        # Pattern 3: Educational Assistant
-        print("3. Educational Assistant Pattern:")
-        education_config = {
-            "temperature": 0.3,
-            "max_length": 800,
-            "top_k": 7,
-            "enable_memory": True,
-            "enable_preprocessing": True
-        }
-        education_agent = EnhancedQuantFinanceAgent(vector_store, education_config)
-        
-        print("All integration patterns initialized successfully!")
-        
-        # Example usage for each pattern
-        test_query = "Explain volatility clustering in financial markets"
-        
-        for name, agent in [("Research", research_agent), ("Trading", trading_agent), ("Education", education_agent)]:
-            result = agent.query(test_query)
+    
+    # Pattern 1: Research Assistant
+    print("1. Research Assistant Pattern:")
+    research_config = {
+        "temperature": 0.1,
+        "max_length": 1024,
+        "top_k": 10,
+        "enable_memory": True
+    }
+    research_agent = _get_agent(vector_store, tuple(sorted(research_config.items())))
+    
+    # Pattern 2: Trading Bot
+    print("2. Trading Bot Pattern:")
+    trading_config = {
+        "temperature": 0.05,
+        "max_length": 256,
+        "top_k": 3,
+        "enable_memory": False,
+        "response_timeout": 5
+    }
+    trading_agent = _get_agent(vector_store, tuple(sorted(trading_config.items())))
+    
+    # Pattern 3: Educational Assistant
+    print("3. Educational Assistant Pattern:")
+    education_config = {
+        "temperature": 0.3,
+        "max_length": 800,
+        "top_k": 7,
+        "enable_memory": True,
+        "enable_preprocessing": True
+    }
+    education_agent = _get_agent(vector_store, tuple(sorted(education_config.items())))
+    
+    print("All integration patterns initialized successfully!")
+    
+    # Example usage for each pattern
+    test_query = "Explain volatility clustering in financial markets"
+    
+    agents = [("Research", research_agent), ("Trading", trading_agent), ("Education", education_agent)]
+    
+    # The agents are independent: submit every query before waiting on any result
+    with ThreadPoolExecutor(max_workers=len(agents)) as executor:
+        futures = {name: executor.submit(agent.query, test_query) for name, agent in agents}
+        for name, future in futures.items():
+            result = future.result()
             print(f"  {name} Agent Response Length: {len(result['result'])} chars")
-        
-    except Exception as e:
-        print(f"Error in integration patterns: {e}")
 
 def save_results_to_file(results):
     """Save example results to a JSON file."""
     try:
         output_file = "agent_examples_output.json"
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        if ORJSON_AVAILABLE:
+            # Datetimes go through default=str, as with the stdlib encoder
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(
+                    results, default=str,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME
+                ))
+        else:
+            with open(output_file, 'w') as f:
+                json.dump(results, f, indent=2, default=str)
         print(f"\n📄 Results saved to {output_file}")
     except Exception as e:
         print(f"Error saving results: {e}")
@@ -384,15 +568,18 @@ def main():
             ("Integration Patterns", example_integration_patterns)
         ]
         
+        # One mock store serves every example
+        shared_vector_store = create_mock_vector_store()
+        
         for example_name, example_func in examples:
-            print(f"\n{'='*20} {example_name} {'='*20}")
-            try:
-                result = example_func()
+            # Collect the example's output and write it to the terminal in one call
+            buffer = io.StringIO()
+            with redirect_stdout(buffer):
+                print(f"\n{'='*20} {example_name} {'='*20}")
+                example_func(shared_vector_store)  # safe_example reports any failure itself
                 results[example_name] = "Success"
                 print(f"✅ {example_name} completed successfully")
-            except Exception as e:
-                results[example_name] = f"Error: {str(e)}"
-                print(f"❌ {example_name} failed: {e}")
+            sys.stdout.write(buffer.getvalue())
         
         # Summary
         print("\n" + "="*70)
@@ -8,6 +8,7 @@ Version: 2.0
 
 import sys
 import os
+import asyncio
 import webbrowser
 from datetime import datetime
 from typing import Optional, List, Dict, Any
@@ -20,28 +21,40 @@ from PyQt5.QtWidgets import (
     QTreeWidget, QTreeWidgetItem, QDialog, QDialogButtonBox,
     QTextBrowser, QFrame
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QUrl
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal, QTimer, QUrl
 from PyQt5.QtGui import QFont, QPalette, QColor, QIcon, QPixmap, QDesktopServices
 from quant_agent import QuantFinanceAgent
 from vector_db import load_vector_store
 
+# qasync runs the Qt event loop as an asyncio loop; without it queries go to the thread pool
+try:
+    import qasync
+    QASYNC_AVAILABLE = True
+except ImportError:
+    QASYNC_AVAILABLE = False
 
-class QueryWorker(QThread):
-    """Worker thread for processing queries to avoid blocking the UI"""
+
+class WorkerSignals(QObject):
+    """Signals emitted by a QueryRunnable (QRunnable cannot define signals itself)"""
     finished = pyqtSignal(dict)
     error = pyqtSignal(str)
+
+
+class QueryRunnable(QRunnable):
+    """Pooled task for processing queries to avoid blocking the UI"""
     
     def __init__(self, agent, query):
         super().__init__()
         self.agent = agent
         self.query = query
+        self.signals = WorkerSignals()
     
     def run(self):
         try:
             response = self.agent.query(self.query)
-            self.finished.emit(response)
+            self.signals.finished.emit(response)
         except Exception as e:
-            self.error.emit(str(e))
+            self.signals.error.emit(str(e))
 
 
 class SourceDialog(QDialog):
@@ -106,7 +119,13 @@ class FinanceAIAssistant(QMainWindow):
         self.agent = agent
         self.conversation_history = []
         self.current_sources = []
-        self.query_worker = None
+        
+        # Queries run on a small shared pool instead of a new thread per message
+        self.pool = QThreadPool.globalInstance()
+        self.pool.setMaxThreadCount(2)
+        self._busy = False
+        self._query_signals = None  # Keeps the in-flight runnable's signals alive until delivery
+        self._query_task = None  # In-flight query coroutine when running under qasync
         
         self.init_ui()
         self.init_menu_bar()
@@ -487,7 +506,7 @@ class FinanceAIAssistant(QMainWindow):
         if not query:
             return
         
-        if self.query_worker and self.query_worker.isRunning():
+        if self._busy:
             QMessageBox.information(self, "Processing", "Please wait for the current query to complete.")
             return
             
@@ -503,22 +522,47 @@ class FinanceAIAssistant(QMainWindow):
         user_message += f"<strong>[{timestamp}] You:</strong><br>{query}</div>"
         self.conversation_display.append(user_message)
         
-        # Start worker thread
-        self.query_worker = QueryWorker(self.agent, query)
-        self.query_worker.finished.connect(self.on_query_finished)
-        self.query_worker.error.connect(self.on_query_error)
-        self.query_worker.start()
-        
-        # Update analytics
+        # One record per turn; on_query_finished fills in the response
         self.conversation_history.append({
             'timestamp': datetime.now(),
             'query': query,
-            'type': 'user'
+            'response': None,
+            'sources': []
         })
+        
+        self._busy = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None  # Plain Qt event loop
+        
+        if loop is not None:
+            # Await the query on the Qt/asyncio loop; no thread or signal objects per query
+            self._query_task = loop.create_task(self._run_query_async(query))
+        else:
+            # Hand the query to the thread pool
+            runnable = QueryRunnable(self.agent, query)
+            runnable.signals.finished.connect(self.on_query_finished, Qt.QueuedConnection)
+            runnable.signals.error.connect(self.on_query_error, Qt.QueuedConnection)
+            self._query_signals = runnable.signals
+            self.pool.start(runnable)
+        
+        # Update analytics
         self.update_analytics()
     
+    async def _run_query_async(self, query):
+        """Run the blocking agent query in the default executor and handle its outcome"""
+        try:
+            response = await asyncio.get_running_loop().run_in_executor(None, self.agent.query, query)
+        except Exception as e:
+            self.on_query_error(str(e))
+        else:
+            self.on_query_finished(response)
+    
     def on_query_finished(self, response):
         """Handle successful query completion"""
+        self._busy = False
+        self._query_signals = None
         self.send_btn.setEnabled(True)
         self.progress_bar.setVisible(False)
         self.status_label.setText("Ready")
@@ -535,13 +579,14 @@ class FinanceAIAssistant(QMainWindow):
         self.current_sources = response.get('source_documents', [])
         self.update_source_tree(self.current_sources)
         
-        # Add to conversation history
-        self.conversation_history.append({
-            'timestamp': datetime.now(),
-            'query': result,
-            'type': 'assistant',
-            'sources': self.current_sources
-        })
+        # Complete the current turn and its history row
+        if self.conversation_history:
+            turn = self.conversation_history[-1]
+            turn['response'] = result
+            turn['sources'] = self.current_sources
+            row_count = self.history_tree.topLevelItemCount()
+            if row_count == len(self.conversation_history):
+                self.history_tree.topLevelItem(row_count - 1).setText(2, str(len(result)))
         
         # Scroll to bottom
         self.conversation_display.verticalScrollBar().setValue(
@@ -550,6 +595,8 @@ class FinanceAIAssistant(QMainWindow):
     
     def on_query_error(self, error_message):
         """Handle query processing error"""
+        self._busy = False
+        self._query_signals = None
         self.send_btn.setEnabled(True)
         self.progress_bar.setVisible(False)
         self.status_label.setText("Error occurred")
@@ -561,8 +608,7 @@ class FinanceAIAssistant(QMainWindow):
     
     def update_source_tree(self, documents):
         """Update source tree with enhanced document information"""
-        self.source_tree.clear()
-        
+        items = []
         for i, doc in enumerate(documents):
             metadata = getattr(doc, 'metadata', {})
             title = metadata.get('title', f'Document {i+1}')
@@ -571,12 +617,26 @@ class FinanceAIAssistant(QMainWindow):
             
             item = QTreeWidgetItem([title, relevance, source_type])
             item.setData(0, Qt.UserRole, metadata)
-            self.source_tree.addItem(item)
+            items.append(item)
+        
+        self._replace_tree_items(self.source_tree, items)
         
         # Auto-resize columns
         for i in range(3):
             self.source_tree.resizeColumnToContents(i)
     
+    def _replace_tree_items(self, tree, items):
+        """Swap a tree's rows for items in one insertion, with painting and sorting suspended"""
+        sorting = tree.isSortingEnabled()
+        tree.setUpdatesEnabled(False)
+        tree.setSortingEnabled(False)
+        try:
+            tree.clear()
+            tree.addTopLevelItems(items)
+        finally:
+            tree.setSortingEnabled(sorting)
+            tree.setUpdatesEnabled(True)
+    
     def open_source_detail(self, item, column):
         """Open detailed view of selected source document"""
         metadata = item.data(0, Qt.UserRole)
@@ -586,7 +646,7 @@ class FinanceAIAssistant(QMainWindow):
     
     def update_analytics(self):
         """Update analytics and statistics"""
-        total_queries = len([h for h in self.conversation_history if h['type'] == 'user'])
+        total_queries = len(self.conversation_history)
         self.stats_labels['total_queries'].setText(str(total_queries))
         
         if self.conversation_history:
@@ -594,24 +654,15 @@ class FinanceAIAssistant(QMainWindow):
             duration = datetime.now() - start_time
             self.stats_labels['session_duration'].setText(str(duration).split('.')[0])
         
-        # Update history tree
-        self.history_tree.clear()
-        for entry in self.conversation_history:
-            if entry['type'] == 'user':
-                timestamp = entry['timestamp'].strftime("%H:%M:%S")
-                query = entry['query'][:50] + "..." if len(entry['query']) > 50 else entry['query']
-                
-                # Find corresponding assistant response
-                response_length = "N/A"
-                for i, h in enumerate(self.conversation_history):
-                    if h == entry and i < len(self.conversation_history) - 1:
-                        next_entry = self.conversation_history[i + 1]
-                        if next_entry['type'] == 'assistant':
-                            response_length = str(len(next_entry['query']))
-                        break
-                
-                item = QTreeWidgetItem([timestamp, query, response_length])
-                self.history_tree.addItem(item)
+        # Add rows only for turns not yet in the history tree
+        items = []
+        for turn in self.conversation_history[self.history_tree.topLevelItemCount():]:
+            timestamp = turn['timestamp'].strftime("%H:%M:%S")
+            query = turn['query'][:50] + "..." if len(turn['query']) > 50 else turn['query']
+            response_length = str(len(turn['response'])) if turn['response'] is not None else "N/A"
+            items.append(QTreeWidgetItem([timestamp, query, response_length]))
+        
+        self.history_tree.addTopLevelItems(items)
     
     def clear_conversation(self):
         """Clear conversation history and reset UI"""
@@ -850,6 +901,14 @@ if __name__ == "__main__":
             (screen.height() - size.height()) // 2
         )
         
+        if QASYNC_AVAILABLE:
+            # Drive Qt from an asyncio loop so process_query can await the agent
+            loop = qasync.QEventLoop(app)
+            asyncio.set_event_loop(loop)
+            with loop:
+                loop.run_forever()
+            sys.exit(0)
+        
         sys.exit(app.exec_())
         
     except Exception as e:
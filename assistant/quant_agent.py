@@ -6,9 +6,13 @@ Version: 2.0
 """
 
 import os
+import copy
 import time
 import logging
-from typing import Dict, List, Optional, Any, Union
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Union, Tuple
 from datetime import datetime
 import numpy as np
 
@@ -24,6 +28,59 @@ from langchain.schema import Document
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Most recent memory-independent answers kept for exact repeats of a question
+RESPONSE_CACHE_SIZE = 256
+# Cached answers expire after this many seconds so sampled responses are regenerated
+RESPONSE_CACHE_TTL = 300
+
+# Longer questions are answered directly instead of being sent through retrieval and the model
+MAX_QUERY_LENGTH = 4000
+
+# Financial concepts reported in response metadata, paired with their lowercased form
+_FINANCIAL_CONCEPTS = tuple((concept, concept.lower()) for concept in (
+    "Black-Scholes", "Monte Carlo", "VaR", "Expected Shortfall",
+    "Markowitz", "CAPM", "volatility", "Greeks", "derivatives",
+    "stochastic calculus", "Ito process", "Brownian motion",
+    "risk management", "portfolio optimization", "arbitrage"
+))
+
+# Context added to queries mentioning a keyword; the first matching keyword wins
+_QUERY_CONTEXT_KEYWORDS = {
+    'option': ['Black-Scholes', 'volatility', 'strike price'],
+    'risk': ['VaR', 'Value at Risk', 'Expected Shortfall'],
+    'portfolio': ['Markowitz', 'optimization', 'efficient frontier'],
+    'volatility': ['stochastic volatility', 'GARCH', 'volatility modeling'],
+    'derivative': ['pricing', 'hedging', 'Greeks'],
+    'credit': ['credit risk', 'default probability', 'credit derivatives']
+}
+
+# Prompt selection keywords, checked in this order
+_RISK_KEYWORDS = ('risk', 'var', 'value at risk', 'expected shortfall', 'stress test')
+_PRICING_KEYWORDS = ('option', 'pricing', 'black-scholes', 'monte carlo', 'derivative')
+_STRATEGY_KEYWORDS = ('strategy', 'trading', 'portfolio', 'optimization', 'backtest')
+
+
+@lru_cache(maxsize=1024)
+def _find_financial_concepts(text: str) -> tuple:
+    """Concepts mentioned in text, in _FINANCIAL_CONCEPTS order; cached since responses repeat."""
+    text_lower = text.lower()
+    return tuple(concept for concept, concept_lower in _FINANCIAL_CONCEPTS
+                 if concept_lower in text_lower)
+
+
+@lru_cache(maxsize=1024)
+def _preprocess_question(question: str) -> str:
+    """Stripped question with retrieval context appended; cached since questions repeat."""
+    question = question.strip()
+    
+    # Add financial context keywords for better retrieval
+    question_lower = question.lower()
+    for keyword, related_terms in _QUERY_CONTEXT_KEYWORDS.items():
+        if keyword in question_lower:
+            return f"{question} (Related to: {', '.join(related_terms[:2])})"
+    
+    return question
+
 
 class EnhancedQuantFinanceAgent:
     """
@@ -51,6 +108,11 @@ class EnhancedQuantFinanceAgent:
         self.conversation_history = []
         self.query_count = 0
         self.total_response_time = 0.0
+        # LRU of (question, use_memory) -> (stored_at, postprocessed result), see _response_cache_key
+        self._response_cache: OrderedDict = OrderedDict()
+        self._response_cache_lock = threading.Lock()  # query may run in several threads
+        self._response_cache_store_size = self._current_store_size()
+        self._metrics_lock = threading.Lock()  # Guards query_count, total_response_time and history
         
         # Initialize components
         self._setup_retriever()
@@ -412,27 +474,7 @@ Answer:"""
         if not self.config["enable_preprocessing"]:
             return question
         
-        # Clean and normalize the question
-        question = question.strip()
-        
-        # Add financial context keywords for better retrieval
-        finance_keywords = {
-            'option': ['Black-Scholes', 'volatility', 'strike price'],
-            'risk': ['VaR', 'Value at Risk', 'Expected Shortfall'],
-            'portfolio': ['Markowitz', 'optimization', 'efficient frontier'],
-            'volatility': ['stochastic volatility', 'GARCH', 'volatility modeling'],
-            'derivative': ['pricing', 'hedging', 'Greeks'],
-            'credit': ['credit risk', 'default probability', 'credit derivatives']
-        }
-        
-        question_lower = question.lower()
-        for keyword, related_terms in finance_keywords.items():
-            if keyword in question_lower:
-                # Enhance question with context
-                question = f"{question} (Related to: {', '.join(related_terms[:2])})"
-                break
-        
-        return question
+        return _preprocess_question(question)
     
     def _postprocess_response(self, response: str, sources: List[Document]) -> Dict[str, Any]:
         """Postprocess response to improve quality and add metadata."""
@@ -470,21 +512,7 @@ Answer:"""
     
     def _extract_financial_concepts(self, response: str) -> List[str]:
         """Extract financial concepts mentioned in the response."""
-        concepts = [
-            "Black-Scholes", "Monte Carlo", "VaR", "Expected Shortfall",
-            "Markowitz", "CAPM", "volatility", "Greeks", "derivatives",
-            "stochastic calculus", "Ito process", "Brownian motion",
-            "risk management", "portfolio optimization", "arbitrage"
-        ]
-        
-        found_concepts = []
-        response_lower = response.lower()
-        
-        for concept in concepts:
-            if concept.lower() in response_lower:
-                found_concepts.append(concept)
-        
-        return found_concepts
+        return list(_find_financial_concepts(response))
     
     def _calculate_response_quality(self, response: str, sources: List[Document]) -> Dict[str, float]:
         """Calculate quality metrics for the response."""
@@ -538,19 +566,86 @@ Answer:"""
         """Select appropriate prompt template based on question content."""
         question_lower = question.lower()
         
-        risk_keywords = ['risk', 'var', 'value at risk', 'expected shortfall', 'stress test']
-        pricing_keywords = ['option', 'pricing', 'black-scholes', 'monte carlo', 'derivative']
-        strategy_keywords = ['strategy', 'trading', 'portfolio', 'optimization', 'backtest']
-        
-        if any(keyword in question_lower for keyword in risk_keywords):
+        if any(keyword in question_lower for keyword in _RISK_KEYWORDS):
             return self.risk_prompt
-        elif any(keyword in question_lower for keyword in pricing_keywords):
+        elif any(keyword in question_lower for keyword in _PRICING_KEYWORDS):
             return self.pricing_prompt
-        elif any(keyword in question_lower for keyword in strategy_keywords):
+        elif any(keyword in question_lower for keyword in _STRATEGY_KEYWORDS):
             return self.strategy_prompt
         else:
             return self.finance_prompt_template
 
+    def _response_cache_key(self, question: str, use_memory: bool) -> Optional[Tuple[str, bool]]:
+        """Cache key for a query, or None when its answer may depend on conversation memory."""
+        if not self.config.get("response_caching", True):
+            return None
+        if self.memory and use_memory:
+            return None
+        return (question, use_memory)
+    
+    def _cached_response(self, key: Tuple[str, bool], start_time: float) -> Optional[Dict[str, Any]]:
+        """Serve a cached result for key with fresh timing metadata, or None on a miss."""
+        with self._response_cache_lock:
+            # Documents added to the store (e.g. by the paper fetcher) invalidate cached answers
+            store_size = self._current_store_size()
+            if store_size != self._response_cache_store_size:
+                self._response_cache_store_size = store_size
+                self._response_cache.clear()
+            
+            entry = self._response_cache.get(key)
+            if entry is None:
+                return None
+            stored_at, cached = entry
+            if time.monotonic() - stored_at > RESPONSE_CACHE_TTL:
+                del self._response_cache[key]
+                return None
+            self._response_cache.move_to_end(key)
+        
+        response_time = time.time() - start_time
+        avg_response_time = self._record_turn(key[0], cached["result"], response_time)
+        
+        # Copies keep callers from mutating the cached entry
+        return {
+            **cached,
+            "source_documents": list(cached["source_documents"]),
+            "metadata": {
+                **copy.deepcopy(cached["metadata"]),
+                "response_time": response_time,
+                "avg_response_time": avg_response_time,
+                "cached": True
+            }
+        }
+    
+    def _current_store_size(self) -> Optional[int]:
+        """Number of vectors in the store when it exposes one (FAISS), else None."""
+        return getattr(getattr(self.vector_store, 'index', None), 'ntotal', None)
+    
+    def _record_turn(self, question: str, response: str, response_time: float) -> float:
+        """Add a finished query to the metrics and history; returns the new average response time."""
+        with self._metrics_lock:
+            self.total_response_time += response_time
+            self.conversation_history.append({
+                "question": question,
+                "response": response,
+                "timestamp": datetime.now(),
+                "response_time": response_time
+            })
+            return self.total_response_time / self.query_count
+    
+    def _store_response(self, key: Tuple[str, bool], result: Dict[str, Any]):
+        """Cache a copy of a result, evicting the least recently used entry when full."""
+        # The caller keeps the original; later changes to it must not reach the cache
+        result = {
+            **result,
+            "source_documents": list(result["source_documents"]),
+            "metadata": copy.deepcopy(result["metadata"])
+        }
+        with self._response_cache_lock:
+            self._response_cache[key] = (time.monotonic(), result)
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+    
     def query(self, question: str, use_memory: bool = True) -> Dict[str, Any]:
         """
         Execute enhanced financial query with preprocessing and postprocessing.
@@ -563,12 +658,34 @@ Answer:"""
             Enhanced response with metadata and quality metrics
         """
         start_time = time.time()
-        self.query_count += 1
+        with self._metrics_lock:
+            self.query_count += 1
+            query_number = self.query_count
+        
+        # Degenerate input is answered without touching the retriever or the model
+        fast_path = self._fast_path(question)
+        if fast_path is not None:
+            logger.info(f"Query {query_number} answered directly ({fast_path})")
+            fast_result = self._create_fast_path_response(question, fast_path)
+            response_time = time.time() - start_time
+            fast_result["metadata"]["response_time"] = response_time
+            fast_result["metadata"]["avg_response_time"] = self._record_turn(
+                question, fast_result["result"], response_time
+            )
+            return fast_result
+        
+        # Exact repeats of memory-independent questions skip retrieval and generation
+        cache_key = self._response_cache_key(question, use_memory)
+        if cache_key is not None:
+            cached = self._cached_response(cache_key, start_time)
+            if cached is not None:
+                logger.info(f"Query {query_number} served from cache: {question[:50]}...")
+                return cached
         
         try:
             # Preprocess the query
             processed_question = self._preprocess_query(question)
-            logger.info(f"Processing query {self.query_count}: {question[:50]}...")
+            logger.info(f"Processing query {query_number}: {question[:50]}...")
             
             # Execute the query
             if self.qa_chain is None:
@@ -592,20 +709,15 @@ Answer:"""
                 result.get("source_documents", [])
             )
             
-            # Update performance metrics
+            # Update performance metrics and conversation history
             response_time = time.time() - start_time
-            self.total_response_time += response_time
-            
             enhanced_result["metadata"]["response_time"] = response_time
-            enhanced_result["metadata"]["avg_response_time"] = self.total_response_time / self.query_count
+            enhanced_result["metadata"]["avg_response_time"] = self._record_turn(
+                question, enhanced_result["result"], response_time
+            )
             
-            # Store conversation history
-            self.conversation_history.append({
-                "question": question,
-                "response": enhanced_result["result"],
-                "timestamp": datetime.now(),
-                "response_time": response_time
-            })
+            if cache_key is not None:
+                self._store_response(cache_key, enhanced_result)
             
             logger.info(f"Query completed in {response_time:.2f}s")
             return enhanced_result
@@ -614,6 +726,50 @@ Answer:"""
             logger.error(f"Query failed: {e}")
             return self._create_error_response(question, str(e))
     
+    def batch_query(self, questions: List[str], use_memory: bool = True) -> List[Dict[str, Any]]:
+        """
+        Execute several queries, e.g. the turns of a conversation, in one call.
+        
+        Turns run in order because each may depend on the memory of the previous ones;
+        exact repeats of memory-independent questions are served from the response cache.
+        
+        Args:
+            questions: The financial questions to answer, in conversation order
+            use_memory: Whether to use conversation memory
+        
+        Returns:
+            One enhanced response per question, in the same order
+        """
+        logger.info(f"Processing batch of {len(questions)} queries")
+        return [self.query(question, use_memory=use_memory) for question in questions]
+    
+    def _fast_path(self, question: str) -> Optional[str]:
+        """Classify questions that need no retrieval: 'empty', 'too_long', or None."""
+        if not question.strip():
+            return "empty"
+        if len(question) > MAX_QUERY_LENGTH:
+            return "too_long"
+        return None
+    
+    def _create_fast_path_response(self, question: str, fast_path: str) -> Dict[str, Any]:
+        """Create the direct response for a question rejected by _fast_path."""
+        if fast_path == "empty":
+            response = "Please ask a question about quantitative finance."
+        else:
+            response = (f"Your question is {len(question)} characters long; please shorten it "
+                        f"to at most {MAX_QUERY_LENGTH} characters.")
+        return {
+            "result": response,
+            "source_documents": [],
+            "metadata": {
+                "error": False,
+                "fast_path": fast_path,
+                "timestamp": datetime.now().isoformat(),
+                "financial_concepts": [],
+                "quality_metrics": {}
+            }
+        }
+    
     def _create_error_response(self, question: str, error: str) -> Dict[str, Any]:
         """Create standardized error response."""
         return {
@@ -657,9 +813,17 @@ Answer:"""
         self.conversation_history.clear()
         logger.info("Memory and conversation history cleared")
     
+    def reset_metrics(self):
+        """Reset the query count and response-time totals, e.g. before reusing the agent."""
+        with self._metrics_lock:
+            self.query_count = 0
+            self.total_response_time = 0.0
+    
     def update_config(self, new_config: Dict[str, Any]):
         """Update agent configuration dynamically."""
         self.config.update(new_config)
+        # Cached answers were produced under the previous configuration
+        self._response_cache.clear()
         
         # Reinitialize components if necessary
         if "top_k" in new_config:
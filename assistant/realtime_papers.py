@@ -9,11 +9,20 @@ Date: August 6, 2025
 import os
 import sys
 import arxiv
+import glob
+import hashlib
 import json
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import logging
 
+# orjson parses large paper snapshots much faster than the stdlib parser
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -22,6 +31,38 @@ logger = logging.getLogger(__name__)
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 
+def latest_papers_file(papers_dir: str = "./data/papers") -> Optional[str]:
+    """Devuelve la ruta del snapshot de papers más reciente, o None si no hay ninguno."""
+    # Snapshots are named papers_YYYYMMDD_HHMMSS.json, so the newest sorts last
+    snapshots = glob.glob(os.path.join(papers_dir, "papers_*.json"))
+    return max(snapshots) if snapshots else None
+
+
+def exact_dedup(papers: List[Dict]) -> List[Dict]:
+    """Elimina papers idénticos (mismo título y resumen), conservando el primero."""
+    seen = set()
+    unique = []
+    for paper in papers:
+        key = hashlib.md5(f"{paper['title']}|{paper.get('abstract', '')}".encode('utf-8')).digest()
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(paper)
+    return unique
+
+
+def load_latest_papers(papers_dir: str = "./data/papers") -> Tuple[Optional[str], List[Dict]]:
+    """Carga el snapshot de papers más reciente y devuelve (ruta, papers)."""
+    latest_file = latest_papers_file(papers_dir)
+    if latest_file is None:
+        return None, []
+    if ORJSON_AVAILABLE:
+        with open(latest_file, 'rb') as f:
+            return latest_file, orjson.loads(f.read())
+    with open(latest_file, 'r', encoding='utf-8') as f:
+        return latest_file, json.load(f)
+
+
 class RealTimePaperFetcher:
     """Descargador de papers en tiempo real desde ArXiv."""
     
@@ -95,8 +136,13 @@ class RealTimePaperFetcher:
                 logger.error(f"❌ Error buscando en {category}: {e}")
                 continue
         
-        logger.info(f"🎉 Total de papers descargados: {len(all_papers)}")
-        return all_papers
+        # Cross-listed papers come back once per category; drop exact repeats up front
+        unique_papers = exact_dedup(all_papers)
+        if len(unique_papers) < len(all_papers):
+            logger.info(f"🧹 {len(all_papers) - len(unique_papers)} papers duplicados eliminados")
+        
+        logger.info(f"🎉 Total de papers descargados: {len(unique_papers)}")
+        return unique_papers
     
     def _is_recent_paper(self, published_date: datetime, days_back: int) -> bool:
         """Verifica si el paper es reciente."""
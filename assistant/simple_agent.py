@@ -8,13 +8,18 @@ Version: 2.0
 import os
 import logging
 import time
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Retrieval results are reused for repeated questions within this window
+RETRIEVAL_CACHE_TTL = 300
+RETRIEVAL_CACHE_SIZE = 1024
+
 
 class SimpleQuantFinanceAgent:
     """
@@ -29,6 +34,8 @@ class SimpleQuantFinanceAgent:
         self.vector_store = vector_store
         self.conversation_history = []
         self.query_count = 0
+        # (normalized question, k) -> (stored at, documents), oldest first
+        self._retrieval_cache: OrderedDict = OrderedDict()
         
         # Check for real-time papers
         self._check_realtime_papers()
@@ -114,6 +121,72 @@ class SimpleQuantFinanceAgent:
             logger.warning(f"Error loading recent papers: {e}")
             return False
     
+    @staticmethod
+    def _retrieval_key(question: str, k: int) -> Tuple[str, int]:
+        """Normalize a question into a retrieval cache key."""
+        return (question.strip().lower(), k)
+    
+    def _cached_documents(self, key: Tuple[str, int]) -> Optional[List]:
+        """Return unexpired cached documents for a key, or None."""
+        entry = self._retrieval_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, docs = entry
+        if time.monotonic() - stored_at > RETRIEVAL_CACHE_TTL:
+            del self._retrieval_cache[key]
+            return None
+        self._retrieval_cache.move_to_end(key)
+        return docs
+    
+    def _store_documents(self, key: Tuple[str, int], docs: List):
+        """Cache retrieved documents, evicting the least recently used entry when full."""
+        self._retrieval_cache[key] = (time.monotonic(), docs)
+        self._retrieval_cache.move_to_end(key)
+        if len(self._retrieval_cache) > RETRIEVAL_CACHE_SIZE:
+            self._retrieval_cache.popitem(last=False)
+    
+    def _retrieve(self, question: str, k: int = 3) -> List:
+        """Retrieve relevant documents, reusing recent results for the same question."""
+        key = self._retrieval_key(question, k)
+        docs = self._cached_documents(key)
+        if docs is None:
+            docs = self.vector_store.similarity_search(question, k=k)
+            self._store_documents(key, docs)
+        return docs
+    
+    def _prefetch_documents(self, questions: List[str], k: int = 3):
+        """Embed all uncached questions in one forward pass and cache their retrievals."""
+        embeddings = getattr(self.vector_store, 'embeddings', None)
+        if not (hasattr(embeddings, 'embed_documents')
+                and hasattr(self.vector_store, 'similarity_search_by_vector')):
+            return
+        misses = {}
+        for question in questions:
+            key = self._retrieval_key(question, k)
+            if key[0] and key not in misses and self._cached_documents(key) is None:
+                misses[key] = question
+        if not misses:
+            return
+        vectors = embeddings.embed_documents(list(misses.values()))
+        for key, vector in zip(misses, vectors):
+            self._store_documents(key, self.vector_store.similarity_search_by_vector(vector, k=k))
+    
+    def query_batch(self, questions: List[str]) -> List[Dict[str, Any]]:
+        """
+        Process several financial queries, embedding them together.
+        
+        Args:
+            questions: The financial questions to answer, in order
+            
+        Returns:
+            List of response dictionaries, one per question
+        """
+        try:
+            self._prefetch_documents(questions)
+        except Exception as e:
+            logger.warning(f"Batch retrieval failed, falling back to per-query search: {e}")
+        return [self.query(question) for question in questions]
+    
     def query(self, question: str) -> Dict[str, Any]:
         """
         Process a financial query and return an intelligent response.
@@ -129,7 +202,7 @@ class SimpleQuantFinanceAgent:
         
         try:
             # Get relevant documents from vector store
-            docs = self.vector_store.similarity_search(question, k=3)
+            docs = self._retrieve(question, k=3)
             
             # Determine the main topic
             main_topic = self._identify_topic(question)
@@ -26,7 +26,7 @@ def test_imports():
         print("✓ vector_db import successful")
         
         # Test GUI import
-        from gui import FinanceAIAssistant, QueryWorker, SourceDialog
+        from gui import FinanceAIAssistant, QueryRunnable, SourceDialog
         print("✓ GUI components import successful")
         
         return True
@@ -1,5 +1,7 @@
 import os
+import hashlib
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from langchain_community.vectorstores import FAISS
 from langchain.schema import Document
@@ -10,6 +12,9 @@ from langchain_community.embeddings import HuggingFaceEmbeddings
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Written next to a saved index; a mismatch with the current corpus forces a rebuild
+CORPUS_HASH_FILENAME = "corpus.sha256"
+
 
 def create_sample_documents() -> List[Document]:
     """Create sample documents for demonstration purposes."""
@@ -118,19 +123,35 @@ def create_sample_documents() -> List[Document]:
     return sample_docs
 
 
-def create_vector_store(documents=None):
-    """Create and return a vector store from a list of documents."""
+@lru_cache(maxsize=1)
+def get_embeddings():
+    """Return the shared HuggingFace embedding model, loading it on first use."""
     # Use HuggingFace embeddings that work offline
     try:
-        embeddings = HuggingFaceEmbeddings(
+        return HuggingFaceEmbeddings(
             model_name="sentence-transformers/all-MiniLM-L6-v2",
             model_kwargs={'device': 'cpu'}
         )
     except Exception as e:
         logger.warning(f"Failed to load HuggingFace embeddings: {e}")
         # Fallback to simpler embeddings
-        from langchain_community.embeddings import HuggingFaceEmbeddings
-        embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+        return HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+
+
+def corpus_fingerprint(documents: List[Document]) -> str:
+    """Return a SHA256 digest identifying the text and titles of a document corpus."""
+    digest = hashlib.sha256()
+    for doc in documents:
+        digest.update(str(doc.metadata.get("title", "")).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(doc.page_content.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def create_vector_store(documents=None):
+    """Create and return a vector store from a list of documents."""
+    embeddings = get_embeddings()
     
     # Create documents if not provided
     if documents is None:
@@ -164,26 +185,32 @@ def create_vector_store(documents=None):
     return vector_store
 
 
+@lru_cache(maxsize=4)
 def load_vector_store(index_path="./knowledge_base/vector_db"):
-    """Load an existing vector store from disk or create a new one."""
-    try:
-        embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2",
-            model_kwargs={'device': 'cpu'}
-        )
-    except Exception as e:
-        logger.warning(f"Failed to load HuggingFace embeddings: {e}")
-        embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+    """Load an existing vector store from disk or create a new one.
+
+    The store is loaded once per index path and shared by every caller in the process.
+    """
+    embeddings = get_embeddings()
+    fingerprint = corpus_fingerprint(create_sample_documents())
+    hash_path = os.path.join(index_path, CORPUS_HASH_FILENAME)
     
-    # Check if vector store already exists
-    if os.path.exists(index_path) and os.path.exists(f"{index_path}.pkl"):
-        try:
-            logger.info(f"Loading existing vector store from {index_path}")
-            vector_store = FAISS.load_local(index_path, embeddings, allow_dangerous_deserialization=True)
-            logger.info(f"Loaded vector store with {vector_store.index.ntotal} documents")
-            return vector_store
-        except Exception as e:
-            logger.warning(f"Failed to load existing vector store: {e}")
+    # Check if vector store already exists and was built from the current corpus
+    if os.path.exists(os.path.join(index_path, "index.faiss")):
+        stored_fingerprint = None
+        if os.path.exists(hash_path):
+            with open(hash_path, "r", encoding="utf-8") as f:
+                stored_fingerprint = f.read().strip()
+        if stored_fingerprint in (None, fingerprint):
+            try:
+                logger.info(f"Loading existing vector store from {index_path}")
+                vector_store = FAISS.load_local(index_path, embeddings, allow_dangerous_deserialization=True)
+                logger.info(f"Loaded vector store with {vector_store.index.ntotal} documents")
+                return vector_store
+            except Exception as e:
+                logger.warning(f"Failed to load existing vector store: {e}")
+        else:
+            logger.info("Source corpus changed since the vector store was saved, rebuilding")
     
     # Create new vector store if loading fails or doesn't exist
     logger.info("Creating new vector store with sample documents")
@@ -191,10 +218,12 @@ def load_vector_store(index_path="./knowledge_base/vector_db"):
     
     # Try to save the new vector store
     try:
-        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        os.makedirs(index_path, exist_ok=True)
         vector_store.save_local(index_path)
+        with open(hash_path, "w", encoding="utf-8") as f:
+            f.write(fingerprint)
         logger.info(f"Vector store saved to {index_path}")
     except Exception as e:
         logger.warning(f"Failed to save vector store: {e}")
     
-    return vector_store
\ No newline at end of file
+    return vector_store